@@ -0,0 +1,100 @@
+"""
+Compare JSON decoders on the recorded fixtures in `benchmarks/fixtures`: the previous decoder, which ran an
+`object_hook` on every object of a str copy of the body, against the parsers in `JSON_DECODERS` reading the
+body bytes directly. Reports the time to decode, and to decode and load the model.
+
+    python benchmarks/bench_decode.py [--iterations 200] [--backend lazy]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from json import JSONDecoder
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from overseerrapi.shared.networking import JSON_DECODERS
+from overseerrapi.types import MODEL_BACKENDS, MediaSearchResult, MovieDetails, Requests, TVDetails
+from overseerrapi.types.load import load_json
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def empty_string_to_none(values: Dict[str, Any]) -> Dict[str, Any]:
+    """The hook the previous decoder ran on every decoded object"""
+    if isinstance(values, list):
+        for i, v in enumerate(values):
+            if not v:
+                values[i] = None
+    elif isinstance(values, dict):
+        for k in values:
+            if not values[k]:
+                values[k] = None
+    return values
+
+
+_previous = JSONDecoder(object_hook=empty_string_to_none).decode
+
+
+def previous_decoder(body: bytes) -> Any:
+    # aiohttp's `ClientResponse.json` decoded the body to a str before parsing it
+    return _previous(body.decode("utf-8"))
+
+
+def fixture(name: str) -> Any:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def payloads() -> Dict[str, Tuple[bytes, type]]:
+    requests = fixture("requests")
+    page = {
+        "pageInfo": {"pages": 1, "pageSize": len(requests), "results": len(requests), "page": 1},
+        "results": requests,
+    }
+    return {
+        name: (json.dumps(data).encode("utf-8"), overseerr_type)
+        for name, data, overseerr_type in (
+            ("movie details", fixture("movie"), MovieDetails),
+            ("tv details", fixture("tv"), TVDetails),
+            ("search page", fixture("search"), MediaSearchResult),
+            ("requests page", page, Requests),
+        )
+    }
+
+
+def per_call(fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    return timeit.timeit(fn, number=iterations) / iterations
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--backend", choices=MODEL_BACKENDS, default="lazy")
+    args = parser.parse_args(argv)
+
+    decoders = {"previous": previous_decoder, **JSON_DECODERS}
+    print(f"model backend: {args.backend}")
+    print(f"{'payload':<16}{'size':>9}{'decoder':>10}{'decode':>12}{'+ load':>12}{'speedup':>9}")
+    for name, (body, overseerr_type) in payloads().items():
+        baseline = None
+        for decoder_name, decode in decoders.items():
+            decode_only = per_call(lambda: decode(body), args.iterations)
+            with_load = per_call(
+                lambda: load_json(json_data=decode(body), overseerr_type=overseerr_type, backend=args.backend),
+                args.iterations,
+            )
+            if baseline is None:
+                baseline = with_load
+            print(
+                f"{name:<16}{len(body) / 1024:>6.1f} KiB{decoder_name:>10}"
+                f"{decode_only * 1e6:>9.1f} us{with_load * 1e6:>9.1f} us{baseline / with_load:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
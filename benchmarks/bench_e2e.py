@@ -0,0 +1,334 @@
+"""
+End-to-end latency of the bot's commands against the local stand-in server in `fake_overseerr.py`.
+
+Drives `OverseerrAPI`, `SearchView` and `RequestsView` the way the cogs and button callbacks do, with a
+mocked Discord interaction, and reports p50/p95/p99 latency, upstream requests per operation and the
+allocation peak of each scenario.
+
+    python benchmarks/bench_e2e.py [--iterations 50] [--latency 0.05] [--jitter 0.02] [--backend slots]
+
+Pass `--json results.json` to keep the numbers for comparing against a later run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("GUILD_ID", "1")
+
+import aiohttp
+
+from overseerrapi import OverseerrAPI
+from overseerrapi.types import MODEL_BACKENDS
+from views import RequestsView, SearchView
+
+GENRE_ID_MAP = {"movie": {}, "tv": {}}
+REQUEST_PARAMS = {"take": 10, "skip": 0, "filter_by": "all", "sort": "added"}
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._interaction = interaction
+
+    async def edit_message(self, **kwargs) -> None:
+        self._interaction.edited(kwargs)
+
+
+class FakeInteraction:
+    """
+    Stands in for `discord.Interaction` in button callbacks, recording when the message was
+    first acknowledged and when it was last edited.
+    """
+
+    def __init__(self) -> None:
+        self.response = FakeResponse(self)
+        self.started = time.perf_counter()
+        self.acked: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def edited(self, kwargs: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if self.acked is None:
+            self.acked = now
+        self.finished = now
+
+    async def edit_original_response(self, **kwargs) -> None:
+        self.edited(kwargs)
+
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[int], Awaitable[Optional[FakeInteraction]]],
+        report_errors: bool = True,
+    ) -> None:
+        self.name = name
+        self.run = run
+        self.report_errors = report_errors
+        self.latencies: List[float] = []
+        self.acks: List[float] = []
+        self.errors = 0
+
+    async def time(self, iteration: int) -> None:
+        start = time.perf_counter()
+        try:
+            interaction = await self.run(iteration)
+        except Exception:
+            self.errors += 1
+            if self.errors == 1 and self.report_errors:
+                print(f"{self.name} failed:", file=sys.stderr)
+                traceback.print_exc()
+            return
+        end = time.perf_counter()
+        if interaction is not None:
+            self.acks.append(interaction.acked - interaction.started)
+            end = interaction.finished
+        self.latencies.append(end - start)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": float("nan"), "p95": float("nan"), "p99": float("nan")}
+    if len(samples) == 1:
+        return {"p50": samples[0], "p95": samples[0], "p99": samples[0]}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+class Harness:
+    def __init__(self, client: OverseerrAPI, server_url: str, args: argparse.Namespace) -> None:
+        self.client = client
+        self.server_url = server_url
+        self.args = args
+        self.view_options = {
+            "prefetch_depth": args.prefetch_depth,
+            "progressive": not args.no_progressive,
+        }
+        self._search_view: Optional[SearchView] = None
+        self._requests_view: Optional[RequestsView] = None
+
+    async def _server(self, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        async with aiohttp.ClientSession() as session:
+            async with session.request(
+                "POST" if body is not None else "GET", self.server_url + path, json=body
+            ) as r:
+                return await r.json()
+
+    def scenarios(self) -> List[Scenario]:
+        return [
+            Scenario("search command", self.search_command),
+            Scenario("search next", self.search_next),
+            Scenario("requests command", self.requests_command),
+            Scenario("requests next", self.requests_next),
+            Scenario("movie details", self.movie_details),
+        ]
+
+    def _new_search_view(self, results) -> SearchView:
+        return SearchView(
+            overseerr_client=self.client,
+            search_query="bench",
+            user_id=1,
+            results=results,
+            genre_id_map=GENRE_ID_MAP,
+            discord_id_map={},
+            **self.view_options,
+        )
+
+    def _new_requests_view(self, requests) -> RequestsView:
+        return RequestsView(
+            requests=requests,
+            overseerr_client=self.client,
+            genre_id_map=GENRE_ID_MAP,
+            discord_id_map={},
+            user_id=1,
+            params=dict(REQUEST_PARAMS),
+            **self.view_options,
+        )
+
+    async def search_command(self, i: int) -> None:
+        results = await self.client.search(f"bench query {i}")
+        view = self._new_search_view(results)
+        await view._edit_embed()
+        view.stop()
+
+    async def requests_command(self, i: int) -> None:
+        requests = await self.client.get_all_requests(**REQUEST_PARAMS)
+        view = self._new_requests_view(requests)
+        await view._edit_embed()
+        view.stop()
+
+    async def search_next(self, i: int) -> FakeInteraction:
+        view = self._search_view
+        if view is None or view.next.disabled:
+            if view is not None:
+                view.stop()
+            view = self._search_view = self._new_search_view(
+                await self.client.search("bench paging")
+            )
+            await view._edit_embed()
+        interaction = FakeInteraction()
+        await view.next.callback(interaction)
+        return interaction
+
+    async def requests_next(self, i: int) -> FakeInteraction:
+        view = self._requests_view
+        if view is None or view.next.disabled:
+            if view is not None:
+                view.stop()
+            view = self._requests_view = self._new_requests_view(
+                await self.client.get_all_requests(**REQUEST_PARAMS)
+            )
+            await view._edit_embed()
+        interaction = FakeInteraction()
+        await view.next.callback(interaction)
+        return interaction
+
+    async def movie_details(self, i: int) -> None:
+        await self.client.get_movie(10_000 + i)
+
+    def _stop_views(self) -> None:
+        for view in (self._search_view, self._requests_view):
+            if view is not None:
+                view.stop()
+        self._search_view = self._requests_view = None
+
+    async def run_scenario(self, scenario: Scenario) -> Dict[str, Any]:
+        self._stop_views()
+        await self._server("/__reset", {})
+        for i in range(self.args.iterations):
+            await scenario.time(i)
+            if self.args.think_time:
+                # Give prefetches the time a user takes to read the embed
+                await asyncio.sleep(self.args.think_time)
+        upstream = (await self._server("/__stats"))["requests"]
+
+        # Separate pass so tracing doesn't skew the timings
+        self._stop_views()
+        tracemalloc.start()
+        traced = Scenario(scenario.name, scenario.run, report_errors=False)
+        for i in range(min(self.args.iterations, 10)):
+            await traced.time(i)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "scenario": scenario.name,
+            "iterations": self.args.iterations,
+            "errors": scenario.errors,
+            "latency": percentiles(scenario.latencies),
+            "ack": percentiles(scenario.acks) if scenario.acks else None,
+            "upstream_requests": upstream,
+            "requests_per_op": upstream / self.args.iterations,
+            "alloc_peak_kib": peak / 1024,
+            "alloc_retained_kib": current / 1024,
+        }
+
+    async def run(self) -> List[Dict[str, Any]]:
+        await self._server(
+            "/__config",
+            {
+                "latency": self.args.latency,
+                "jitter": self.args.jitter,
+                "error_rate": self.args.error_rate,
+            },
+        )
+        results = []
+        start = time.perf_counter()
+        async with self.client:
+            print(f"startup: {(time.perf_counter() - start) * 1000:.1f} ms (login, /auth/me, pool warm-up)")
+            for scenario in self.scenarios():
+                if self.args.scenario and scenario.name not in self.args.scenario:
+                    continue
+                results.append(await self.run_scenario(scenario))
+                print_row(results[-1])
+            self._stop_views()
+        return results
+
+
+def print_header() -> None:
+    print(
+        f"{'scenario':<18}{'p50':>9}{'p95':>9}{'p99':>9}{'ack p50':>9}"
+        f"{'req/op':>8}{'errors':>8}{'peak':>11}"
+    )
+
+
+def print_row(result: Dict[str, Any]) -> None:
+    ms = {k: v * 1000 for k, v in result["latency"].items()}
+    ack = f"{result['ack']['p50'] * 1000:>6.1f} ms" if result["ack"] else f"{'-':>9}"
+    print(
+        f"{result['scenario']:<18}{ms['p50']:>6.1f} ms{ms['p95']:>6.1f} ms{ms['p99']:>6.1f} ms"
+        f"{ack}{result['requests_per_op']:>8.2f}{result['errors']:>8}"
+        f"{result['alloc_peak_kib']:>7.0f} KiB"
+    )
+
+
+def start_server() -> Tuple[subprocess.Popen, str]:
+    """Run the stand-in server in its own process so its work doesn't count against the bot"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "fake_overseerr.py"), "--port", "0", "--seed", "0"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    if not line.startswith("Listening on "):
+        process.kill()
+        raise RuntimeError(f"Fake overseerr failed to start: {line!r}")
+    return process, line[len("Listening on ") :].strip()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fake server adds to every response")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between iterations")
+    parser.add_argument("--backend", choices=MODEL_BACKENDS, default="lazy")
+    parser.add_argument("--detail-cache-ttl", type=float, default=0)
+    parser.add_argument("--search-cache-ttl", type=float, default=0)
+    parser.add_argument("--prefetch-depth", type=int, default=2)
+    parser.add_argument("--no-progressive", action="store_true")
+    parser.add_argument("--scenario", action="append", help="Only run the named scenario; repeatable")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    process, url = start_server()
+    try:
+        client = OverseerrAPI(
+            url,
+            api_key="bench",
+            email="bench@example.com",
+            password="bench",
+            log_level="WARNING",
+            detail_cache_ttl=args.detail_cache_ttl,
+            search_cache_ttl=args.search_cache_ttl,
+            model_backend=args.backend,
+        )
+        print_header()
+        results = asyncio.run(Harness(client, url, args).run())
+    finally:
+        process.terminate()
+        process.wait()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    failed = [result["scenario"] for result in results if result["errors"]]
+    if failed:
+        sys.exit(f"Scenarios with errors: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare model backends: time and memory to load a search page and a TV details payload.
+
+    python benchmarks/bench_models.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from overseerrapi.types import MediaSearchResult, TVDetails, MODEL_BACKENDS
+from overseerrapi.types.load import load_json
+from overseerrapi.shared.networking import DECODER
+
+
+def search_page():
+    results = []
+    for i in range(20):
+        result = {
+            "id": 1000 + i,
+            "mediaType": "movie" if i % 2 else "tv",
+            "overview": "An overview " * 20,
+            "popularity": 12.5 + i,
+            "posterPath": f"/poster{i}.jpg",
+            "backdropPath": f"/backdrop{i}.jpg",
+            "genreIds": [18, 35, 10765],
+            "originalLanguage": "en",
+            "voteAverage": 7.4,
+            "voteCount": 1200 + i,
+            "mediaInfo": {"id": i, "tmdbId": 1000 + i, "status": 5},
+        }
+        if i % 2:
+            result.update(title=f"Movie {i}", releaseDate="2021-05-01")
+        else:
+            result.update(name=f"Show {i}", firstAirDate="2019-09-12")
+        results.append(result)
+    return {"page": 1, "totalPages": 3, "totalResults": 60, "results": results}
+
+
+def tv_details():
+    return {
+        "id": 1399,
+        "name": "A Long Running Show",
+        "overview": "Overview " * 50,
+        "firstAirDate": "2011-04-17",
+        "lastAirDate": "2019-05-19",
+        "genres": [{"id": 18, "name": "Drama"}, {"id": 10765, "name": "Sci-Fi & Fantasy"}],
+        "seasons": [
+            {
+                "id": s,
+                "airDate": "2011-04-17",
+                "episodeCount": 10,
+                "name": f"Season {s}",
+                "seasonNumber": s,
+            }
+            for s in range(1, 31)
+        ],
+        "credits": {
+            "cast": [
+                {"id": c, "castId": c, "character": f"Character {c}", "creditId": f"c{c}", "name": f"Actor {c}", "order": c}
+                for c in range(200)
+            ],
+            "crew": [
+                {"id": c, "creditId": f"w{c}", "name": f"Crew {c}", "job": "Writer", "department": "Writing"}
+                for c in range(300)
+            ],
+        },
+        "networks": [{"id": 49, "name": "HBO", "originCountry": "US"}],
+        "productionCompanies": [{"id": i, "name": f"Company {i}"} for i in range(10)],
+        "keywords": [{"id": i, "name": f"keyword {i}"} for i in range(40)],
+        "mediaInfo": {"id": 1, "tmdbId": 1399, "status": 5},
+        "popularity": 369.6,
+        "voteAverage": 8.4,
+        "voteCount": 21000,
+    }
+
+
+def measure(raw: str, overseerr_type, backend: str, iterations: int):
+    def run():
+        return load_json(json_data=DECODER(raw), overseerr_type=overseerr_type, backend=backend)
+
+    run()
+    seconds = timeit.timeit(run, number=iterations) / iterations
+    tracemalloc.start()
+    model = run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del model
+    return seconds, current, peak
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    payloads = {
+        "search page": (json.dumps(search_page()), MediaSearchResult),
+        "tv details": (json.dumps(tv_details()), TVDetails),
+    }
+    print(f"{'payload':<14}{'backend':<12}{'decode+load':>14}{'retained':>12}{'peak':>12}")
+    for name, (raw, overseerr_type) in payloads.items():
+        for backend in MODEL_BACKENDS:
+            seconds, current, peak = measure(raw, overseerr_type, backend, iterations)
+            print(
+                f"{name:<14}{backend:<12}{seconds * 1e6:>11.1f} us"
+                f"{current / 1024:>9.1f} KiB{peak / 1024:>9.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
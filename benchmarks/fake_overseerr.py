@@ -0,0 +1,378 @@
+"""
+Local stand-in for the Overseerr API, serving the JSON fixtures in `benchmarks/fixtures`.
+
+Covers the endpoints `OverseerrAPI` uses. Detail endpoints reuse one fixture per media type with the
+requested id patched in, list endpoints page through the fixture lists. Every response can be delayed
+by `latency` seconds plus up to `jitter` seconds, and fail with a 503 with probability `error_rate`.
+
+    python benchmarks/fake_overseerr.py [--port 5055] [--latency 0.05] [--jitter 0.02] [--error-rate 0]
+
+Point OVERSEERR_URL at the printed address. Accepts any api key, and any email/password on /auth/local.
+
+Besides the Overseerr routes the server exposes:
+    GET  /__stats   Request counts per route
+    POST /__reset   Reset counts and the request fixtures
+    POST /__config  Change latency, jitter and error_rate, e.g. {"latency": 0.1}
+    POST /__expire_sessions  Forget every session cookie handed out, like overseerr restarting with a new secret
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SESSION_COOKIE = "connect.sid"
+
+# Request status: 1 pending, 2 approved, 3 declined. Media status: 3 processing, 5 available.
+_REQUEST_FILTERS = {
+    "all": lambda r: True,
+    "pending": lambda r: r["status"] == 1,
+    "approved": lambda r: r["status"] == 2,
+    "processing": lambda r: r["status"] == 2 and r["media"]["status"] == 3,
+    "available": lambda r: r["media"]["status"] == 5,
+    "unavailable": lambda r: r["status"] == 2 and r["media"]["status"] != 5,
+    "failed": lambda r: r["status"] == 4,
+}
+
+_USER_SORTS = {
+    "created": lambda u: u["createdAt"],
+    "updated": lambda u: u["updatedAt"],
+    "requests": lambda u: -u.get("requestCount", 0),
+    "displayname": lambda u: u["username"].casefold(),
+}
+
+
+def load_fixtures(path: str = FIXTURES_DIR) -> Dict[str, Any]:
+    fixtures = {}
+    for name in os.listdir(path):
+        if name.endswith(".json"):
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                fixtures[name[: -len(".json")]] = json.load(f)
+    return fixtures
+
+
+def _page_info(total: int, take: int, skip: int) -> Dict[str, int]:
+    return {
+        "pages": max(1, -(-total // take)),
+        "pageSize": take,
+        "results": total,
+        "page": skip // take + 1,
+    }
+
+
+def _int_param(request: web.Request, name: str, default: int) -> int:
+    try:
+        return int(request.query.get(name, default))
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"Invalid {name}")
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"status": status, "message": message}, status=status)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class FakeOverseerr:
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Any]] = None,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.counts: Counter = Counter()
+        self.sessions: set = set()
+        self._random = random.Random(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.requests: List[Dict[str, Any]] = copy.deepcopy(self.fixtures["requests"])
+        self.users: List[Dict[str, Any]] = self.fixtures["users"]
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/__stats", self.stats)
+        app.router.add_post("/__reset", self.reset_handler)
+        app.router.add_post("/__config", self.config)
+        app.router.add_post("/__expire_sessions", self.expire_sessions)
+        app.router.add_get("/status", self.status)
+        app.router.add_post("/auth/local", self.login)
+        app.router.add_get("/auth/me", self.me)
+        app.router.add_get("/search", self.search)
+        app.router.add_get("/movie/{id:\\d+}", self.movie)
+        app.router.add_get("/movie/{id:\\d+}/recommendations", self.recommendations)
+        app.router.add_get("/tv/{id:\\d+}", self.tv)
+        app.router.add_get("/tv/{id:\\d+}/season/{season:\\d+}", self.tv_season)
+        app.router.add_get("/tv/{id:\\d+}/recommendations", self.recommendations)
+        app.router.add_get("/genres/movie", self.genres)
+        app.router.add_get("/genres/tv", self.genres)
+        app.router.add_get("/user", self.user_list)
+        app.router.add_get("/user/{id:\\d+}", self.user)
+        app.router.add_get("/request", self.request_list)
+        app.router.add_post("/request", self.create_request)
+        app.router.add_get("/request/{id:\\d+}", self.request)
+        app.router.add_post("/request/{id:\\d+}/{status:approve|decline}", self.modify_request)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        if request.path.startswith("/__"):
+            return await handler(request)
+        route = request.match_info.route.resource
+        self.counts[f"{request.method} {route.canonical if route else request.path}"] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _error(503, "Injected error")
+        if (
+            request.path not in ("/auth/local", "/status")
+            and "X-Api-Key" not in request.headers
+            and request.cookies.get(SESSION_COOKIE) not in self.sessions
+        ):
+            # Like overseerr, a missing or expired session is a 403 rather than a 401
+            return _error(403, "You do not have permission to access this endpoint")
+        return await handler(request)
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"requests": sum(self.counts.values()), "routes": dict(self.counts)}
+        )
+
+    async def reset_handler(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.json_response({})
+
+    async def config(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        for name in ("latency", "jitter", "error_rate"):
+            if name in body:
+                setattr(self, name, float(body[name]))
+        return web.json_response(
+            {"latency": self.latency, "jitter": self.jitter, "error_rate": self.error_rate}
+        )
+
+    async def expire_sessions(self, request: web.Request) -> web.Response:
+        expired = len(self.sessions)
+        self.sessions.clear()
+        return web.json_response({"expired": expired})
+
+    async def login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not body.get("email") or not body.get("password"):
+            return _error(401, "Unauthorized")
+        response = web.json_response(self.users[0])
+        session = f"s:{self._random.getrandbits(64):x}"
+        self.sessions.add(session)
+        # overseerr's sessions last 30 days
+        response.set_cookie(SESSION_COOKIE, session, max_age=30 * 24 * 3600, httponly=True)
+        return response
+
+    async def status(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"version": "1.33.2", "commitTag": "fake", "updateAvailable": False, "commitsBehind": 0}
+        )
+
+    async def me(self, request: web.Request) -> web.Response:
+        return web.json_response(self.users[0])
+
+    def _search_page(self, page: int, id_offset: int = 0) -> Dict[str, Any]:
+        fixture = self.fixtures["search"]
+        results = []
+        for result in fixture["results"]:
+            result = dict(result, id=result["id"] + id_offset + (page - 1) * 100)
+            if result.get("mediaInfo"):
+                result["mediaInfo"] = dict(result["mediaInfo"], tmdbId=result["id"])
+            results.append(result)
+        return dict(fixture, page=page, results=results)
+
+    async def search(self, request: web.Request) -> web.Response:
+        if not request.query.get("query"):
+            return _error(400, "query is required")
+        page = _int_param(request, "page", 1)
+        if not 1 <= page <= self.fixtures["search"]["totalPages"]:
+            return web.json_response(dict(self.fixtures["search"], page=page, results=[]))
+        return web.json_response(self._search_page(page))
+
+    async def recommendations(self, request: web.Request) -> web.Response:
+        page = _int_param(request, "page", 1)
+        return web.json_response(self._search_page(page, id_offset=50_000))
+
+    def _details(self, fixture: str, id: int) -> Dict[str, Any]:
+        details = dict(self.fixtures[fixture], id=id)
+        details["mediaInfo"] = dict(details["mediaInfo"], tmdbId=id, mediaType=fixture)
+        return details
+
+    async def movie(self, request: web.Request) -> web.Response:
+        id = int(request.match_info["id"])
+        details = self._details("movie", id)
+        details["title"] = f"{details['title']} {id}"
+        return web.json_response(details)
+
+    async def tv(self, request: web.Request) -> web.Response:
+        id = int(request.match_info["id"])
+        details = self._details("tv", id)
+        details["name"] = f"{details['name']} {id}"
+        return web.json_response(details)
+
+    async def tv_season(self, request: web.Request) -> web.Response:
+        id = int(request.match_info["id"])
+        number = int(request.match_info["season"])
+        seasons = {s["seasonNumber"]: s for s in self.fixtures["tv"]["seasons"]}
+        if number not in seasons:
+            return _error(404, "Season not found")
+        season = dict(seasons[number])
+        episode = self.fixtures["tv"]["lastEpisodeToAir"]
+        season["episodes"] = [
+            dict(episode, id=id * 1000 + n, episodeNumber=n, seasonNumber=number, showId=id)
+            for n in range(1, season["episodeCount"] + 1)
+        ]
+        return web.json_response(season)
+
+    async def genres(self, request: web.Request) -> web.Response:
+        media_type = request.path.rsplit("/", 1)[-1]
+        return web.json_response(self.fixtures[f"genres_{media_type}"])
+
+    async def user_list(self, request: web.Request) -> web.Response:
+        take = _int_param(request, "take", 10)
+        skip = _int_param(request, "skip", 0)
+        sort = _USER_SORTS.get(request.query.get("sort", "created"))
+        if sort is None:
+            return _error(400, "Invalid sort")
+        users = sorted(self.users, key=sort)
+        return web.json_response(
+            {
+                "pageInfo": _page_info(len(users), take, skip),
+                "results": users[skip : skip + take],
+            }
+        )
+
+    async def user(self, request: web.Request) -> web.Response:
+        id = int(request.match_info["id"])
+        user = next((u for u in self.users if u["id"] == id), None)
+        if user is None:
+            return _error(404, "User not found")
+        settings = {"id": id, "locale": "en", "region": "US", "discordId": str(10**17 + id)}
+        return web.json_response(dict(user, settings=settings))
+
+    async def request_list(self, request: web.Request) -> web.Response:
+        take = _int_param(request, "take", 10)
+        skip = _int_param(request, "skip", 0)
+        keep = _REQUEST_FILTERS.get(request.query.get("filter", "all"))
+        if keep is None:
+            return _error(400, "Invalid filter")
+        requests = [r for r in self.requests if keep(r)]
+        if "requestedBy" in request.query:
+            requested_by = _int_param(request, "requestedBy", 0)
+            requests = [r for r in requests if r["requestedBy"]["id"] == requested_by]
+        sort_key = "updatedAt" if request.query.get("sort") == "modified" else "createdAt"
+        requests.sort(key=lambda r: r[sort_key], reverse=True)
+        return web.json_response(
+            {
+                "pageInfo": _page_info(len(requests), take, skip),
+                "results": requests[skip : skip + take],
+            }
+        )
+
+    def _find_request(self, request: web.Request) -> Optional[Dict[str, Any]]:
+        id = int(request.match_info["id"])
+        return next((r for r in self.requests if r["id"] == id), None)
+
+    async def request(self, request: web.Request) -> web.Response:
+        found = self._find_request(request)
+        if found is None:
+            return _error(404, "Request not found")
+        return web.json_response(found)
+
+    async def create_request(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        media_type = body.get("mediaType")
+        if media_type not in ("movie", "tv") or not body.get("mediaId"):
+            return _error(400, "mediaType and mediaId are required")
+        template = self.requests[-1]
+        created = dict(
+            template,
+            id=max(r["id"] for r in self.requests) + 1,
+            status=1,
+            type=media_type,
+            media=dict(template["media"], tmdbId=body["mediaId"], mediaType=media_type, status=2),
+            requestedBy=self.users[0],
+            modifiedBy=None,
+            createdAt=_now(),
+            updatedAt=_now(),
+        )
+        self.requests.append(created)
+        return web.json_response(created, status=201)
+
+    async def modify_request(self, request: web.Request) -> web.Response:
+        found = self._find_request(request)
+        if found is None:
+            return _error(404, "Request not found")
+        found["status"] = 2 if request.match_info["status"] == "approve" else 3
+        found["modifiedBy"] = self.users[0]
+        found["updatedAt"] = _now()
+        return web.json_response(found)
+
+
+async def serve(
+    server: FakeOverseerr, host: str = "127.0.0.1", port: int = 0
+) -> web.AppRunner:
+    """Start serving in the running loop. Port 0 picks a free port, see `runner.addresses`."""
+    runner = web.AppRunner(server.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = FakeOverseerr(
+        load_fixtures(args.fixtures),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    runner = await serve(server, args.host, args.port)
+    host, port = runner.addresses[0][:2]
+    print(f"Listening on http://{host}:{port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, uniformly")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses failing with a 503")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -1,12 +1,19 @@
+import atexit
 import os
+import queue
 
 import discord
 from dotenv import load_dotenv
+from overseerrapi.shared.metrics import start_metrics_server
+from overseerrapi.shared import logs
 import logging
+import logging.handlers
 
 
 load_dotenv()
 log = None
+metrics_runner = None
+log_listener = None
 
 
 def init():
@@ -37,15 +44,16 @@ BOT = discord.Bot(
     indents=INTENTS,
 )
 
-from functools import partial, partialmethod
-
 
 def setup_logging():
+    """Log through a queue, so the event loop never waits on writing to stderr"""
+    global log_listener
     log = logging.getLogger()
-    logging.TRACE = 5
-    logging.addLevelName(logging.TRACE, "TRACE")
-    logging.Logger.trace = partialmethod(logging.Logger.log, logging.TRACE)
-    logging.trace = partial(logging.log, logging.TRACE)
+    logs.setup_logging()
+    logs.configure_payloads(
+        limit=int(os.environ.get("LOG_PAYLOAD_LIMIT", 2000)),
+        sample_rate=float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", 1)),
+    )
 
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     log.setLevel(log_level)
@@ -55,7 +63,14 @@ def setup_logging():
         "[{asctime}] [{levelname}] [{name}] {message}", style="{"
     )
     handler.setFormatter(formatter)
-    log.addHandler(handler)
+    # Records are formatted and written by the listener's thread
+    log_queue = queue.SimpleQueue()
+    log.addHandler(logs.DeferredQueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
     logging.getLogger("discord").setLevel("ERROR")
     log.info("Logging initialized.")
     log.info("Log level set to %s", log_level)
@@ -73,9 +88,21 @@ def main():
     BOT.run(token)
 
 
+async def start_metrics():
+    """Serve /metrics on METRICS_PORT, if set"""
+    global metrics_runner
+    port = os.environ.get("METRICS_PORT")
+    if not port or metrics_runner is not None:
+        return
+    metrics_runner = await start_metrics_server(
+        host=os.environ.get("METRICS_HOST", "127.0.0.1"), port=int(port)
+    )
+
+
 @BOT.event
 async def on_ready():
     log.info("Bot ready.")
+    await start_metrics()
     await BOT.change_presence(
         activity=discord.Activity(
             type=discord.ActivityType.watching, name="For requests"
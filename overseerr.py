@@ -1,63 +1,439 @@
 import os
+import asyncio
+import aiohttp
+import time
+from contextlib import aclosing
+from datetime import datetime
 import discord
 from discord.ext import commands, tasks
-from discord.commands import slash_command, Option
-from discord.commands.context import ApplicationContext
+from discord.commands import slash_command, Option, OptionChoice
+from discord.commands.context import ApplicationContext, AutocompleteContext
 import shared
-from overseerrapi import OverseerrAPI
+import snapshot
+from request_index import RequestIndex
+from title_index import TitleIndex
+from webhook import WebhookServer, notification_embed, parse_notification_types
+from overseerrapi import OverseerrAPI, Priority
+from overseerrapi.shared.ratelimit import DEFAULT_BUDGETS
+from overseerrapi.shared.exceptions import CircuitOpenException
+from overseerrapi.shared.networking import set_json_decoder
+from overseerrapi.shared.metrics import REGISTRY
+from overseerrapi.shared.logs import TRACE, log_payload
 import traceback as tb
 import logging
-from overseerrapi.types import Requests, MediaSearchResult
+from overseerrapi.types import Request, Requests, MediaSearchResult, User, ErrorResponse, WebhookPayload
 
-from typing import Dict, Any
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 
-from views import SearchView, RequestsView
+from views import SearchView, RequestsView, ConfirmView, BulkProgress, EmbedCache
 
 log = logging.getLogger(__name__)
 
+COMMAND_DURATION = REGISTRY.histogram(
+    "bot_command_duration_seconds",
+    "Time from a slash command being invoked to its results being shown",
+    ["command"],
+)
+COMMAND_ERRORS = REGISTRY.counter(
+    "bot_command_errors", "Slash commands that failed with an error", ["command"]
+)
+AUTOCOMPLETES = REGISTRY.counter(
+    "bot_autocompletes",
+    "Title autocomplete lookups by where the suggestions came from",
+    ["source"],
+)
+WEBHOOKS = REGISTRY.counter(
+    "bot_webhooks", "Overseerr webhook notifications received", ["type"]
+)
+
+DEFAULT_WEBHOOK_NOTIFY = (
+    "MEDIA_PENDING,MEDIA_APPROVED,MEDIA_AUTO_APPROVED,MEDIA_AVAILABLE,MEDIA_DECLINED,MEDIA_FAILED"
+)
+
+
+def _endpoint_budgets() -> Optional[Dict[str, int]]:
+    """Parse OVERSEERR_ENDPOINT_BUDGETS, e.g. `search=4,detail=6`, over the default budgets"""
+    value = os.environ.get("OVERSEERR_ENDPOINT_BUDGETS")
+    if not value:
+        return None
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in value.split(","):
+        endpoint, _, limit = item.partition("=")
+        budgets[endpoint.strip()] = int(limit)
+    return budgets
+
+
+def _error_message(error: Exception, default: str) -> str:
+    original = getattr(error, "original", error)
+    if isinstance(original, CircuitOpenException):
+        return f"Overseerr is unavailable right now, try again in {original.retry_in:.0f} seconds."
+    return default
+
+
+DEFAULT_SESSION_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "overseerr_session.json"
+)
+
 
 class Overseerr(commands.Cog):
     def __init__(self, bot: discord.Bot):
         self._bot = bot
+        set_json_decoder(os.environ.get("OVERSEERR_JSON_DECODER") or None)
         self.overseerr_client = OverseerrAPI(
             url=os.environ.get("OVERSEERR_URL"),
             email=os.environ.get("OVERSEERR_USER"),
             password=os.environ.get("OVERSEERR_PASS"),
             api_key=os.environ.get("OVERSEERR_API_KEY"),
+            connection_limit_per_host=int(
+                os.environ.get("OVERSEERR_CONNECTIONS_PER_HOST", 10)
+            ),
+            detail_cache_ttl=float(os.environ.get("OVERSEERR_DETAIL_CACHE_TTL", 0)),
+            search_cache_ttl=float(os.environ.get("OVERSEERR_SEARCH_CACHE_TTL", 120)),
+            search_cache_size=int(os.environ.get("OVERSEERR_SEARCH_CACHE_SIZE", 256)),
+            model_backend=os.environ.get("OVERSEERR_MODEL_BACKEND", "lazy"),
+            max_concurrency=int(os.environ.get("OVERSEERR_MAX_CONCURRENCY", 0)) or None,
+            rate_limit=float(os.environ.get("OVERSEERR_RATE_LIMIT", 0)) or None,
+            rate_burst=int(os.environ.get("OVERSEERR_RATE_BURST", 0)) or None,
+            endpoint_budgets=_endpoint_budgets(),
+            retry_attempts=int(os.environ.get("OVERSEERR_RETRY_ATTEMPTS", 3)),
+            retry_deadline=float(os.environ.get("OVERSEERR_RETRY_DEADLINE", 15)),
+            circuit_failure_threshold=int(
+                os.environ.get("OVERSEERR_CIRCUIT_FAILURES", 5)
+            ),
+            circuit_reset_timeout=float(os.environ.get("OVERSEERR_CIRCUIT_RESET", 30)),
+            stale_ttl=float(os.environ.get("OVERSEERR_STALE_TTL", 3600)),
+            session_file=os.environ.get("OVERSEERR_SESSION_FILE", DEFAULT_SESSION_PATH) or None,
+        )
+
+        self._genre_id_map: Dict[str, Dict[int, str]] = {"movie": {}, "tv": {}}
+        self._embed_cache = EmbedCache(
+            maxsize=int(os.environ.get("EMBED_CACHE_SIZE", 512))
+        )
+        self._discord_id_map: Dict[int, int] = {}
+        self._user_discord_ids: Dict[int, int] = {}
+        self._user_updated_at: Dict[int, datetime] = {}
+        self._prefetch_depth = int(os.environ.get("VIEW_PREFETCH_DEPTH", 2))
+        self._progressive_render = (
+            os.environ.get("VIEW_PROGRESSIVE_RENDER", "true").lower() == "true"
+        )
+        self._snapshot_path = os.environ.get(
+            "OVERSEERR_SNAPSHOT_FILE", snapshot.DEFAULT_SNAPSHOT_PATH
         )
+        self._load_snapshot()
+        self._user_fetch_concurrency = int(
+            os.environ.get("DISCORD_ID_MAP_CONCURRENCY", 8)
+        )
+        self._user_page_size = int(os.environ.get("DISCORD_ID_MAP_PAGE_SIZE", 50))
+        self._incremental_user_sync = (
+            os.environ.get("DISCORD_ID_MAP_INCREMENTAL", "true").lower() == "true"
+        )
+        self._request_index = RequestIndex()
+        self._request_index_enabled = (
+            os.environ.get("REQUEST_INDEX", "true").lower() == "true"
+        )
+        self._request_index_full_sync = float(
+            os.environ.get("REQUEST_INDEX_FULL_SYNC", 6)
+        ) * 3600
+        self.sync_request_index.change_interval(
+            seconds=float(os.environ.get("REQUEST_INDEX_SYNC_INTERVAL", 60))
+        )
+        self._title_index = TitleIndex(
+            maxsize=int(os.environ.get("TITLE_INDEX_SIZE", 5000))
+        )
+        self._title_fetch_batch = int(os.environ.get("TITLE_INDEX_REQUEST_BATCH", 20))
+        self._autocomplete_debounce = float(
+            os.environ.get("AUTOCOMPLETE_DEBOUNCE", 0.3)
+        )
+        self._autocomplete_search_interval = float(
+            os.environ.get("AUTOCOMPLETE_SEARCH_INTERVAL", 1)
+        )
+        self._autocomplete_min_local = int(os.environ.get("AUTOCOMPLETE_MIN_LOCAL", 5))
+        self._autocomplete_pending: Dict[int, object] = {}
+        self._last_autocomplete_search = 0.0
+        self._bulk_concurrency = int(os.environ.get("BULK_CONCURRENCY", 4))
+        self._bulk_progress_interval = float(
+            os.environ.get("BULK_PROGRESS_INTERVAL", 2)
+        )
+        self._webhook_port = int(os.environ.get("WEBHOOK_PORT", 0))
+        self._webhook_channel_id = int(os.environ.get("WEBHOOK_CHANNEL_ID", 0))
+        self._webhook_notify = parse_notification_types(
+            os.environ.get("WEBHOOK_NOTIFY", DEFAULT_WEBHOOK_NOTIFY)
+        )
+        self._webhook_server = WebhookServer(
+            self._on_webhook,
+            auth=os.environ.get("WEBHOOK_AUTH"),
+            path=os.environ.get("WEBHOOK_PATH", "/webhook"),
+        )
+
+    def _load_snapshot(self) -> None:
+        """Seed the maps from disk so commands work before the first refresh finishes"""
+        saved = snapshot.load_snapshot(self._snapshot_path)
+        if saved is None:
+            return
+        self._genre_id_map.update(saved["genre_id_map"])
+        self._discord_id_map.update(saved["discord_id_map"])
+        self._user_discord_ids.update(saved["user_discord_ids"])
+        self._user_updated_at.update(saved["user_updated_at"])
+
+    async def _save_snapshot(self) -> None:
+        try:
+            await asyncio.to_thread(
+                snapshot.save_snapshot,
+                genre_id_map={media_type: dict(genres) for media_type, genres in self._genre_id_map.items()},
+                discord_id_map=dict(self._discord_id_map),
+                user_discord_ids=dict(self._user_discord_ids),
+                user_updated_at=dict(self._user_updated_at),
+                path=self._snapshot_path,
+            )
+        except OSError as e:
+            log.warning("Failed to save map snapshot: %s", e)
+
+    def cog_unload(self):
+        self.map_discord_ids.cancel()
+        self.map_genre_ids.cancel()
+        self.sync_request_index.cancel()
+        self._bot.loop.create_task(self._webhook_server.stop())
+        self._bot.loop.create_task(self.overseerr_client.close())
 
     @commands.Cog.listener()
     async def on_ready(self):
         log.info("Overseerr cog loading...")
+        await self.overseerr_client.start()
         log.info("Starting Discord ID map task..")
-        # self.map_discord_ids.start()
-        self.map_genre_ids.start()
+        if not self.map_discord_ids.is_running():
+            self.map_discord_ids.start()
+        if not self.map_genre_ids.is_running():
+            self.map_genre_ids.start()
         log.info("Discord ID map task started")
+        if self._request_index_enabled and not self.sync_request_index.is_running():
+            self.sync_request_index.start()
+        if self._webhook_port and not self._webhook_server.running:
+            await self._webhook_server.start(
+                os.environ.get("WEBHOOK_HOST", "0.0.0.0"), self._webhook_port
+            )
         log.info("Overseerr cog ready.")
 
     @tasks.loop(hours=1)
     async def map_discord_ids(self):
+        # tasks.loop stops for good on anything but connection errors, the next run retries instead.
+        # The map is only replaced once every user was listed, so a failed run keeps the previous one.
+        try:
+            with self.overseerr_client.background():
+                await self._map_discord_ids()
+        except Exception as e:
+            log.warning("Failed to update discord id map: %s", e)
+
+    async def _map_discord_ids(self):
         log.debug("Updating discord id map...")
-        discord_id_map = {}
-        users = await self.overseerr_client.users()
-        for user in users.results:
-            user_full = await self.overseerr_client.user(user.id)
-            discord_id_map[int(user_full.settings.discord_id)] = user_full.id
+        users = await self._list_users()
+        if self._incremental_user_sync:
+            stale = [
+                user
+                for user in users
+                if self._user_updated_at.get(user.id) != user.updated_at
+            ]
+        else:
+            stale = users
+        log.debug("Fetching %d of %d users", len(stale), len(users))
 
-        self._discord_id_map = discord_id_map
+        semaphore = asyncio.Semaphore(self._user_fetch_concurrency)
+
+        async def fetch_user(user_id: int) -> User | ErrorResponse:
+            async with semaphore:
+                return await self.overseerr_client.user(user_id)
+
+        fetched = await asyncio.gather(
+            *(fetch_user(user.id) for user in stale), return_exceptions=True
+        )
+        for user, user_full in zip(stale, fetched):
+            if isinstance(user_full, (Exception, ErrorResponse)):
+                log.warning("Failed to fetch user %d: %s", user.id, user_full)
+                continue
+            self._user_updated_at[user.id] = user.updated_at
+            discord_id = user_full.settings and user_full.settings.discord_id
+            if discord_id:
+                self._user_discord_ids[user.id] = int(discord_id)
+            else:
+                self._user_discord_ids.pop(user.id, None)
+
+        # Forget users that were deleted from overseerr
+        current_ids = {user.id for user in users}
+        for user_id in set(self._user_updated_at) - current_ids:
+            self._user_updated_at.pop(user_id, None)
+            self._user_discord_ids.pop(user_id, None)
+
+        self._discord_id_map.clear()
+        self._discord_id_map.update(
+            {discord_id: user_id for user_id, discord_id in self._user_discord_ids.items()}
+        )
         log.info("Updated discord user id map")
-        log.trace("Id map: %s", discord_id_map)
+        log_payload(log, TRACE, "Id map: %s", self._discord_id_map)
+        await self._save_snapshot()
+
+    async def _list_users(self) -> List[User]:
+        return [
+            user
+            async for user in self.overseerr_client.users_iterator(
+                page_size=self._user_page_size
+            )
+        ]
 
     @tasks.loop(hours=168)
     async def map_genre_ids(self):
-        movies = await self.overseerr_client.get_tv_genres()
-        tvs = await self.overseerr_client.get_tv_genres()
-        genre_id_map = {
-            "movie": {x["id"]: x["name"] for x in movies},
-            "tv": {x["id"]: x["name"] for x in tvs},
-        }
+        try:
+            with self.overseerr_client.background():
+                movies, tvs = await asyncio.gather(
+                    self.overseerr_client.get_movie_genres(),
+                    self.overseerr_client.get_tv_genres(),
+                )
+        except CircuitOpenException as e:
+            log.warning("Failed to update genre id map: %s", e)
+            return
+        for genres in (movies, tvs):
+            if isinstance(genres, ErrorResponse):
+                # Keeps the previous map, the next run tries again
+                log.warning("Failed to update genre id map: %s", genres.message or genres.status)
+                return
+        self._genre_id_map.update(
+            {
+                "movie": {x["id"]: x["name"] for x in movies},
+                "tv": {x["id"]: x["name"] for x in tvs},
+            }
+        )
+        self._embed_cache.genre_map_changed()
         log.debug("Genre ID map retrieved")
-        self._genre_id_map = genre_id_map
+        await self._save_snapshot()
+
+    @tasks.loop(seconds=60)
+    async def sync_request_index(self):
+        """Fetch requests modified since the last run, reloading every request now and then to drop deleted ones"""
+        index = self._request_index
+        full = (
+            not index.ready
+            or (datetime.now() - index.loaded_at).total_seconds()
+            >= self._request_index_full_sync
+        )
+        try:
+            with self.overseerr_client.background():
+                if full:
+                    log.debug("Loading request index...")
+                    await index.load(self.overseerr_client)
+                else:
+                    await index.sync(self.overseerr_client)
+                await self._index_request_titles()
+        except Exception as e:
+            log.warning("Failed to sync request index: %s", e)
+
+    async def _index_request_titles(self) -> None:
+        """Add the titles of requested media to the autocomplete index, a batch per sync"""
+        missing = {}
+        for request in self._request_index:
+            media = request.media
+            if media is None or media.media_type not in ("movie", "tv"):
+                continue
+            key = (media.media_type, media.tmdb_id)
+            if key not in self._title_index and key not in missing:
+                missing[key] = media
+                if len(missing) >= self._title_fetch_batch:
+                    break
+        if not missing:
+            return
+        details = await asyncio.gather(
+            *(
+                self.overseerr_client.get_movie(tmdb_id)
+                if media_type == "movie"
+                else self.overseerr_client.get_tv(tmdb_id)
+                for media_type, tmdb_id in missing
+            ),
+            return_exceptions=True,
+        )
+        for result in details:
+            if not isinstance(result, (Exception, ErrorResponse)):
+                self._title_index.add_result(result)
+        log.debug("Indexed titles of %d requested media", len(missing))
+
+    async def _complete_title(self, ctx: AutocompleteContext) -> List[OptionChoice]:
+        """
+        Suggest titles from the local index. While too few are known, search overseerr once the user
+        stops typing for `AUTOCOMPLETE_DEBOUNCE` seconds, at most once per `AUTOCOMPLETE_SEARCH_INTERVAL`.
+        """
+        query = (ctx.value or "").strip()
+        if len(query) < 2:
+            return []
+        entries = self._title_index.complete(query)
+        if len(entries) < self._autocomplete_min_local and await self._autocomplete_search(
+            ctx.interaction.user.id, query
+        ):
+            entries = self._title_index.complete(query)
+            AUTOCOMPLETES.inc(source="search")
+        else:
+            AUTOCOMPLETES.inc(source="index")
+        return [OptionChoice(name=entry.label, value=entry.title[:100]) for entry in entries]
+
+    async def _autocomplete_search(self, user_id: int, query: str) -> bool:
+        """Search overseerr for `query` into the title index, unless debounced or throttled"""
+        token = object()
+        self._autocomplete_pending[user_id] = token
+        await asyncio.sleep(self._autocomplete_debounce)
+        if self._autocomplete_pending.get(user_id) is not token:
+            # The user kept typing, a later keystroke searches instead
+            return False
+        del self._autocomplete_pending[user_id]
+        now = time.monotonic()
+        if now - self._last_autocomplete_search < self._autocomplete_search_interval:
+            return False
+        self._last_autocomplete_search = now
+        try:
+            with self.overseerr_client.priority(Priority.PREFETCH):
+                # Discord drops autocomplete answers after 3 seconds
+                results = await asyncio.wait_for(
+                    self.overseerr_client.search(query),
+                    2.5 - self._autocomplete_debounce,
+                )
+        except (asyncio.TimeoutError, aiohttp.ClientError, CircuitOpenException) as e:
+            log.debug("Autocomplete search for %s failed: %s", query, e)
+            return False
+        if isinstance(results, ErrorResponse):
+            return False
+        self._title_index.add_results(results.results)
+        return True
+
+    async def _on_webhook(self, payload: WebhookPayload) -> None:
+        WEBHOOKS.inc(type=payload.notification_type or "unknown")
+        media = payload.media
+        if media is not None and media.media_type in ("movie", "tv") and media.tmdb_id:
+            self.overseerr_client.invalidate_media(media.media_type, media.tmdb_id)
+        if payload.request is not None and payload.request.request_id is not None:
+            await self._refresh_request(payload.request.request_id)
+        if payload.notification_type in self._webhook_notify:
+            await self._notify(payload)
+
+    async def _refresh_request(self, request_id: int) -> None:
+        request = await self.overseerr_client.get_request(request_id)
+        if isinstance(request, ErrorResponse):
+            if request.status == 404:
+                self._request_index.remove(request_id)
+            else:
+                log.warning("Failed to refresh request %d: %s", request_id, request.message)
+            return
+        self._request_index.upsert(request)
+
+    async def _notify(self, payload: WebhookPayload) -> None:
+        if not self._webhook_channel_id:
+            return
+        try:
+            channel = self._bot.get_channel(
+                self._webhook_channel_id
+            ) or await self._bot.fetch_channel(self._webhook_channel_id)
+            await channel.send(embed=notification_embed(payload))
+        except discord.HTTPException as e:
+            log.warning("Failed to post webhook notification: %s", e)
+
+    def _requests_source(self) -> Callable[..., Awaitable[Requests]]:
+        """Read requests from the local index once it is loaded"""
+        if self._request_index_enabled and self._request_index.ready:
+            return self._request_index.get_all_requests
+        return self.overseerr_client.get_all_requests
 
     @slash_command(
         name="search",
@@ -67,7 +443,13 @@ class Overseerr(commands.Cog):
     async def _search(
         self,
         ctx: ApplicationContext,
-        query: Option(str, "Media to search for.", name="media_title", required=True),
+        query: Option(
+            str,
+            "Media to search for.",
+            name="media_title",
+            required=True,
+            autocomplete=_complete_title,
+        ),
         page: Option(
             int,
             "Media to search for.",
@@ -78,21 +460,26 @@ class Overseerr(commands.Cog):
         ),
     ):
         """Searches for a movie or tv show"""
+        start = time.perf_counter()
         requester_role = await shared.get_role(ctx.guild, "Requester")
         if requester_role not in ctx.author.roles:
             return await ctx.respond(content="You are not allowed to use this command.")
         await ctx.respond(content=f"Searching for {query}...")
         results = await self.overseerr_client.search(query, page)
+        if not isinstance(results, ErrorResponse):
+            self._title_index.add_results(results.results)
         view = self.get_search_view(results, query, user_id=ctx.user.id)
         await view._edit_embed()
         await ctx.edit(embed=view.embed, view=view, content=f"Results for: {query}")
+        COMMAND_DURATION.observe(time.perf_counter() - start, command="search")
 
     @_search.error
     async def _search_error(self, ctx: ApplicationContext, error):
+        COMMAND_ERRORS.inc(command="search")
         trace = tb.format_exception(error)
         log.error(error)
         log.debug(trace)
-        await ctx.respond(content="An error occurred while searching..")
+        await ctx.respond(content=_error_message(error, "An error occurred while searching.."))
 
     @slash_command(
         name="requests",
@@ -108,6 +495,7 @@ class Overseerr(commands.Cog):
             name="page_size",
             required=False,
             default=20,
+            min_value=1,
         ),
         skip: Option(
             int,
@@ -142,6 +530,7 @@ class Overseerr(commands.Cog):
         ),
     ):
         """View your requests"""
+        start = time.perf_counter()
         approver_role = await shared.get_role(ctx.guild, "Approver")
         if approver_role not in ctx.author.roles:
             return await ctx.respond("You are not allowed to use this command.")
@@ -152,26 +541,145 @@ class Overseerr(commands.Cog):
             "sort": sort,
         }
         await ctx.respond("Fetching requests...")
-        requests = await self.overseerr_client.get_all_requests(**params)
-        view = self.get_request_view(params, requests, user_id=ctx.user.id)
+        fetch_page = self._requests_source()
+        requests = await fetch_page(**params)
+        view = self.get_request_view(
+            params, requests, user_id=ctx.user.id, fetch_page=fetch_page
+        )
         await view._edit_embed()
         await ctx.edit(embed=view.embed, view=view, content="")
+        COMMAND_DURATION.observe(time.perf_counter() - start, command="requests")
 
     @_requests.error
     async def _requests_error(self, ctx: ApplicationContext, error):
+        COMMAND_ERRORS.inc(command="requests")
         print(error)
-        await ctx.respond("An error occurred while searching..")
+        await ctx.respond(_error_message(error, "An error occurred while searching.."))
+
+    @slash_command(
+        name="moderate",
+        default_permission=False,
+        guild_ids=[int(os.environ.get("GUILD_ID"))],
+    )
+    async def _moderate(
+        self,
+        ctx: ApplicationContext,
+        action: Option(
+            str,
+            "Approve or decline the matching requests.",
+            required=True,
+            choices=["approve", "decline"],
+        ),
+        filter: Option(
+            str,
+            "Requests to act on.",
+            required=False,
+            name="request_type",
+            choices=[
+                "all",
+                "approved",
+                "available",
+                "pending",
+                "processing",
+                "unavailable",
+                "failed",
+            ],
+            default="pending",
+        ),
+        limit: Option(
+            int,
+            "Maximum number of requests to act on.",
+            required=False,
+            min_value=1,
+            default=None,
+        ),
+    ):
+        """Approve or decline every request matching a filter"""
+        approver_role = await shared.get_role(ctx.guild, "Approver")
+        if approver_role not in ctx.author.roles:
+            return await ctx.respond("You are not allowed to use this command.")
+        await ctx.respond("Finding requests...")
+        requests = await self._matching_requests(filter, limit)
+        if not requests:
+            return await ctx.edit(content=f"No {filter} requests. You are caught up.")
+        confirm = ConfirmView(ctx.user.id)
+        await ctx.edit(
+            content=f"{action.capitalize()} {len(requests)} {filter} requests?",
+            view=confirm,
+        )
+        await confirm.wait()
+        if not confirm.confirmed:
+            return await ctx.edit(content="Cancelled.", view=None)
+
+        progress = BulkProgress(action, len(requests))
+        run = asyncio.create_task(
+            self.overseerr_client.moderate_requests(
+                [request.id for request in requests],
+                action,
+                concurrency=self._bulk_concurrency,
+                on_result=progress.add,
+            )
+        )
+        await ctx.edit(content="", embed=progress.embed(), view=None)
+        # Edits are throttled, Discord rate limits them per message
+        while not run.done():
+            await asyncio.wait({run}, timeout=self._bulk_progress_interval)
+            if not run.done():
+                try:
+                    await ctx.edit(embed=progress.embed())
+                except discord.HTTPException as e:
+                    # The next edit catches up, the requests are moderated either way
+                    log.warning("Failed to update the bulk progress: %s", e)
+        result = run.result()
+        for item in result.succeeded:
+            self._request_moderated(item.result)
+        await ctx.edit(embed=progress.embed(finished=True))
+
+    @_moderate.error
+    async def _moderate_error(self, ctx: ApplicationContext, error):
+        COMMAND_ERRORS.inc(command="moderate")
+        log.error(error)
+        log.debug(tb.format_exception(error))
+        await ctx.respond(_error_message(error, "An error occurred while moderating requests.."))
+
+    async def _matching_requests(self, filter_by: str, limit: Optional[int]) -> List[Request]:
+        if self._request_index_enabled and self._request_index.ready:
+            return self._request_index.query(
+                take=limit or max(len(self._request_index), 1), filter_by=filter_by
+            ).results
+        requests = []
+        iterator = self.overseerr_client.requests_iterator(page_size=100, filter_by=filter_by)
+        async with aclosing(iterator):
+            async for request in iterator:
+                requests.append(request)
+                if limit and len(requests) >= limit:
+                    break
+        return requests
+
+    def _request_moderated(self, request: Request) -> None:
+        # The client already dropped the cached media showing the old status
+        if self._request_index_enabled:
+            self._request_index.upsert(request)
 
     def get_request_view(
-        self, params: Dict[str, Any], requests: Requests, user_id: int
+        self,
+        params: Dict[str, Any],
+        requests: Requests,
+        user_id: int,
+        fetch_page: Optional[Callable[..., Awaitable[Requests]]] = None,
     ) -> RequestsView:
         return RequestsView(
             user_id=user_id,
             overseerr_client=self.overseerr_client,
-            discord_id_map={},  # self._discord_id_map,
+            discord_id_map=self._discord_id_map,
             genre_id_map=self._genre_id_map,
             requests=requests,
             params=params,
+            prefetch_depth=self._prefetch_depth,
+            progressive=self._progressive_render,
+            fetch_page=fetch_page,
+            request_index=self._request_index if self._request_index_enabled else None,
+            embed_cache=self._embed_cache,
         )
 
     def get_search_view(
@@ -182,8 +690,11 @@ class Overseerr(commands.Cog):
             overseerr_client=self.overseerr_client,
             results=results,
             search_query=search_query,
-            discord_id_map={},  # self._discord_id_map,
+            discord_id_map=self._discord_id_map,
             genre_id_map=self._genre_id_map,
+            prefetch_depth=self._prefetch_depth,
+            progressive=self._progressive_render,
+            embed_cache=self._embed_cache,
         )
 
 
@@ -1,4 +1,6 @@
 from .api.client import OverseerrAPI as OverseerrAPI
+from .shared.ratelimit import Priority as Priority
+from .shared.bulk import BulkItemResult as BulkItemResult, BulkResult as BulkResult
 from .types import *
 
 all = ["OverseerrAPI", *types.__all__]
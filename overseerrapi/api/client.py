@@ -1,8 +1,10 @@
 import logging
 import sys
 import asyncio
-from aiohttp import ClientResponse, ClientResponseError
-from functools import partial, partialmethod
+from aiohttp import ClientError, ClientResponse, ClientResponseError, ClientSession
+from functools import partial
+from http.cookies import SimpleCookie
+from contextlib import aclosing
 from typing import (
     Dict,
     TextIO,
@@ -11,11 +13,29 @@ from typing import (
     Self,
     Literal,
     List,
+    Any,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Iterable,
+    Tuple,
 )
-from ..shared.networking import get, post, put
+from ..shared.networking import get, post, put, create_session
 from ..types import *
 from ..types.load import load_error
-from ..shared.wrappers import _request_with_type as request_with_type
+from ..shared.wrappers import _request_with_type as request_with_type, _cached as cached
+from ..shared.bulk import BulkItemResult, BulkResult, run_bulk
+from ..shared.cache import TTLCache
+from ..shared.text import normalize_query
+from ..shared.singleflight import SingleFlight
+from ..shared.auth import SessionManager
+from ..shared.logs import default_handler, log_payload, setup_logging
+from ..shared.exceptions import ForbiddenException, UnauthorizedException
+from ..shared.pagination import prefetch_pages
+from ..shared.retry import RetryPolicy, RetryBudget
+from ..shared.breaker import CircuitBreaker, CircuitStates
+from ..shared.metrics import REGISTRY
+from ..shared.ratelimit import Governor, Priority, priority, DEFAULT_BUDGETS
 
 
 __all__ = ["OverseerrAPI"]
@@ -31,6 +51,27 @@ class OverseerrAPI:
         password: Optional[str] = None,
         log_level: str = "INFO",
         log_file: str | TextIO = sys.stderr,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 10,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: Optional[int] = 300,
+        detail_cache_ttl: Optional[float] = None,
+        detail_cache_size: int = 256,
+        search_cache_ttl: Optional[float] = None,
+        search_cache_size: int = 256,
+        model_backend: ModelBackends = "lazy",
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[int] = None,
+        endpoint_budgets: Optional[Dict[str, int]] = None,
+        retry_attempts: int = 3,
+        retry_deadline: Optional[float] = 15.0,
+        circuit_failure_threshold: int = 5,
+        circuit_reset_timeout: float = 30.0,
+        stale_ttl: Optional[float] = None,
+        warm_connections: int = 2,
+        session_file: Optional[str] = None,
+        session_renew_before: float = 86400,
     ) -> Self:
         setup_logging()
         self._url = url
@@ -38,21 +79,139 @@ class OverseerrAPI:
         self._me = None
         self._password: str = password
         self._email: str = email
+        self._auth = SessionManager(
+            url,
+            partial(self._login, None, None) if email and password else None,
+            self._session_valid,
+            path=session_file,
+            renew_before=session_renew_before,
+        )
+        self._warm_connections = warm_connections
+        self._http: Optional[ClientSession] = None
+        self._session_options = {
+            "limit": connection_limit,
+            "limit_per_host": connection_limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": dns_cache_ttl,
+        }
+        if model_backend not in MODEL_BACKENDS:
+            raise RuntimeError(f"Invalid model backend: `{model_backend}`")
+        self._model_backend = model_backend
+        self._inflight = SingleFlight()
+        # Only idempotent calls are retried, see `networking.get`
+        self._retry = RetryPolicy(
+            attempts=retry_attempts, deadline=retry_deadline, budget=RetryBudget()
+        )
+        self._governor = Governor(
+            max_concurrency=max_concurrency or connection_limit_per_host,
+            rate=rate_limit,
+            burst=rate_burst,
+            budgets=DEFAULT_BUDGETS if endpoint_budgets is None else endpoint_budgets,
+        )
+        self._breaker = CircuitBreaker(
+            failure_threshold=circuit_failure_threshold,
+            reset_timeout=circuit_reset_timeout,
+        )
+        # With only a stale_ttl, entries are never served fresh but kept as a fallback for outages
+        self._detail_cache: Optional[TTLCache] = (
+            TTLCache(
+                ttl=detail_cache_ttl or 0,
+                maxsize=detail_cache_size,
+                stale_ttl=stale_ttl or 0,
+            )
+            if detail_cache_ttl or stale_ttl
+            else None
+        )
+        # Keyed by normalized query and page, see `search`
+        self._search_cache: Optional[TTLCache] = (
+            TTLCache(
+                ttl=search_cache_ttl or 0,
+                maxsize=search_cache_size,
+                stale_ttl=stale_ttl or 0,
+            )
+            if search_cache_ttl or stale_ttl
+            else None
+        )
 
         self._logger = logging.getLogger(__name__)
-        ch = logging.StreamHandler(log_file)
-        formatter = logging.Formatter(
-            "[%(asctime)s] [%(name)s - %(levelname)s] %(message)s"
-        )
-        ch.setFormatter(formatter)
-        ch.setLevel(log_level.upper())
-        self._logger.addHandler(ch)
+        # Only used if the application doesn't configure logging, and shared by every client
+        default_handler(log_level, log_file)
         self._logger.debug("Initialized OverseerrAPI")
 
-        if email and password:
-            asyncio.run(self._login(email, password))
+    @classmethod
+    async def create(cls, url: str, **kwargs: Any) -> Self:
+        """
+        Construct a client and `start` it.
+
+        :param url: The overseerr API URL
+        :type url: str
+        :param kwargs: See `OverseerrAPI`
+        :return: The started client
+        :rtype: OverseerrAPI
+        """
+        client = cls(url, **kwargs)
+        await client.start()
+        return client
+
+    async def start(self) -> None:
+        """
+        Open the pooled HTTP session. If an email and password were given, log in and fetch the current user
+        while connections to overseerr are opened in parallel. Safe to call more than once.
+
+        A session persisted to `session_file` by a previous run is reused without logging in. It isn't checked
+        up front: if overseerr rejects it, the first call to fail logs in again and is replayed.
+        """
+        if self._http is None or self._http.closed:
+            self._http = create_session(**self._session_options)
+            self._logger.debug("Opened pooled HTTP session")
+        REGISTRY.register_collector(self._collect_metrics)
+        if self._auth.can_login and not self._auth.valid:
+            if await self._auth.load():
+                self._logger.debug("Reusing the persisted session")
+                await asyncio.gather(self.get_me(), self._warm_up())
+            else:
+                await asyncio.gather(self._authenticate(), self._warm_up())
+
+    async def _authenticate(self) -> None:
+        if not await self._auth.renew():
+            raise RuntimeError("Failed to log in to overseerr")
+        # Needs the session cookie, so only the warm-up runs alongside the login
+        await self.get_me()
+
+    async def _warm_up(self) -> None:
+        """
+        Open `warm_connections` connections to overseerr ahead of the first calls, so they don't pay for the
+        TCP and TLS handshakes. `/status` needs no authentication.
+        """
+
+        async def connect() -> None:
+            try:
+                async with self._session.get(self._url + "/status") as r:
+                    await r.read()
+            except (ClientError, asyncio.TimeoutError) as e:
+                self._logger.debug("Connection warm-up failed: %s", e)
 
-    async def _login(self, email: Optional[str], password: Optional[str]) -> None:
+        await asyncio.gather(*(connect() for _ in range(self._warm_connections)))
+
+    async def close(self) -> None:
+        """
+        Close the pooled HTTP session and release its connections.
+        """
+        await self._auth.close()
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+            self._logger.debug("Closed pooled HTTP session")
+        self._http = None
+        REGISTRY.unregister_collector(self._collect_metrics)
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _login(self, email: Optional[str], password: Optional[str]) -> SimpleCookie:
         self._logger.debug("Logging in with email and password")
         if email is None:
             email = self._email
@@ -68,23 +227,44 @@ class OverseerrAPI:
             body={"email": email, "password": password},
             headers=self._headers,
             raw=True,
+            session=self._session,
         )
-        print(login)
         try:
             login.raise_for_status()
         except ClientResponseError as cre:
-            login_err = load_error(login.json())
+            login_err = load_error(await login.json())
             self._logger.error("Error while logging in: %s", login_err.message)
             raise cre
-        self.__cookies = login.cookies
         self._logger.debug("Successfully logged in")
+        return login.cookies
 
-    @request_with_type(overseerr_type=MediaSearchResult)
+    async def _session_valid(self) -> bool:
+        """
+        Whether overseerr still accepts the session cookie. Sent without the API key, which would be accepted instead.
+        """
+        try:
+            await get(
+                self._url + "/auth/me",
+                headers=self._headers,
+                cookies=self._cookies,
+                session=self._session,
+            )
+        except (UnauthorizedException, ForbiddenException):
+            return False
+        return True
+
+    @cached(
+        "search",
+        cache="_search_cache",
+        key=lambda query, page=1: (normalize_query(query), page),
+    )
+    @request_with_type(overseerr_type=MediaSearchResult, coalesce=True, budget="search")
     async def search(
         self, query: str, page: int = 1
     ) -> Union[MediaSearchResult, ErrorResponse]:
         """
         Search for a movie, tv, or person by name.
+        Results are cached per page for queries that only differ in case, whitespace or diacritics.
 
         :param query: A movie, tv, or person name to search for
         :type query: str
@@ -99,23 +279,107 @@ class OverseerrAPI:
             params=params,
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
     
     async def search_res_iterator(
-        self, query: str, page: int = 1
-    ):
-        resp: MediaSearchResult = await self.search(query, page)
-        page_num = 0
-        while page_num < resp.total_pages:
-            page_num = resp.page
-            for res in resp.results:
-                yield res
-                
-            if page_num != resp.total_pages:
-                resp = await self.search(query, page=page_num+1)
-                
-
-    @request_with_type(overseerr_type=User)
+        self, query: str, page: int = 1, *, lookahead: int = 1
+    ) -> AsyncIterator[Union[MovieResult, TvResult, PersonResult]]:
+        """
+        Iterate over every search result starting at `page`, prefetching the following pages.
+
+        :param query: A movie, tv, or person name to search for
+        :type query: str
+        :param page: The page of results to start at
+        :type page: int
+        :param lookahead: The number of pages to prefetch
+        :type lookahead: int
+        :return: Search results
+        """
+        pages = prefetch_pages(
+            lambda number: self.search(query, page=number),
+            lambda res: res.total_pages,
+            start=page,
+            lookahead=lookahead,
+        )
+        async with aclosing(pages):
+            async for res in pages:
+                for result in res.results:
+                    yield result
+
+    async def requests_iterator(
+        self,
+        *,
+        page_size: int = 20,
+        lookahead: int = 1,
+        filter_by: RequestsFilterByOpts = "all",
+        sort: RequestsSortOpts = "added",
+        requested_by: Optional[int] = None,
+    ) -> AsyncIterator[Request]:
+        """
+        Iterate over every request, prefetching the following pages.
+
+        :param page_size: The number of requests fetched per page
+        :type page_size: int
+        :param lookahead: The number of pages to prefetch
+        :type lookahead: int
+        :param filter_by: The type of requests to return. See `get_all_requests`
+        :type filter_by: str
+        :param sort: The field to sort by. Must be `"added"` or `"modified"`
+        :type sort: str
+        :param requested_by: The ID of the user to return requests for
+        :type requested_by: Optional[int]
+        :return: Requests
+        """
+        pages = prefetch_pages(
+            lambda number: self.get_all_requests(
+                take=page_size,
+                skip=(number - 1) * page_size,
+                filter_by=filter_by,
+                sort=sort,
+                requested_by=requested_by,
+            ),
+            lambda res: res.page_info.pages,
+            lookahead=lookahead,
+        )
+        async with aclosing(pages):
+            async for res in pages:
+                for request in res.results:
+                    yield request
+
+    async def users_iterator(
+        self,
+        *,
+        page_size: int = 50,
+        lookahead: int = 1,
+        sort: UsersSortOpts = "created",
+    ) -> AsyncIterator[User]:
+        """
+        Iterate over every user, prefetching the following pages.
+
+        :param page_size: The number of users fetched per page
+        :type page_size: int
+        :param lookahead: The number of pages to prefetch
+        :type lookahead: int
+        :param sort: The field to sort by. See `users`
+        :type sort: str
+        :return: Users
+        """
+        pages = prefetch_pages(
+            lambda number: self.users(
+                take=page_size, skip=(number - 1) * page_size, sort=sort
+            ),
+            lambda res: res.page_info.pages,
+            lookahead=lookahead,
+        )
+        async with aclosing(pages):
+            async for res in pages:
+                for user in res.results:
+                    yield user
+
+    @request_with_type(overseerr_type=User, coalesce=True, budget="users")
     async def user(self, id: int) -> Union[User, ErrorResponse]:
         """
         Retrieve a user by ID
@@ -126,22 +390,43 @@ class OverseerrAPI:
         :rtype: Union[User, ErrorResponse]
         """
         return await get(
-            self._url + f"/user/{id}", headers=self._headers, cookies=self._cookies
+            self._url + f"/user/{id}",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=UserSearchResult)
-    async def users(self) -> Union[UserSearchResult, ErrorResponse]:
+    @request_with_type(overseerr_type=UserSearchResult, coalesce=True, budget="users")
+    async def users(
+        self, *, take: int = 10, skip: int = 0, sort: UsersSortOpts = "created"
+    ) -> Union[UserSearchResult, ErrorResponse]:
         """
-        Retrieve all users
+        Retrieve a page of users
 
-        :return: All users, or an error
+        :param take: The number of results to return
+        :type take: int
+        :param skip: The number of results to skip
+        :type skip: int
+        :param sort: The field to sort by. Must be one of: "created", "updated", "requests", "displayname"
+        :type sort: str
+        :return: A page of users, or an error
         :rtype: Union[UserSearchResult, ErrorResponse]
         """
+        if sort not in USERS_SORT_OPTS:
+            raise RuntimeError(f"Invalid sort: `{sort}`")
         return await get(
-            self._url + "/user", headers=self._headers, cookies=self._cookies
+            self._url + "/user",
+            params={"take": take, "skip": skip, "sort": sort},
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=Request)
+    @request_with_type(overseerr_type=Request, coalesce=True, budget="requests")
     async def get_request(self, id: int) -> Union[Request, ErrorResponse]:
         """
         Get a request by ID
@@ -152,10 +437,16 @@ class OverseerrAPI:
         :rtype: Union[Request, ErrorResponse]
         """
         return await get(
-            self._url + f"/request/{id}", headers=self._headers, cookies=self._cookies
+            self._url + f"/request/{id}",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=MovieDetails)
+    @cached("movie")
+    @request_with_type(overseerr_type=MovieDetails, coalesce=True, budget="detail")
     async def get_movie(self, id: int) -> Union[MovieDetails, ErrorResponse]:
         """
         Get a movie by ID.
@@ -166,10 +457,15 @@ class OverseerrAPI:
         :rtype: Union[MovieDetails, ErrorResponse]
         """
         return await get(
-            self._url + f"/movie/{id}", headers=self._headers, cookies=self._cookies
+            self._url + f"/movie/{id}",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=MovieSearchResult)
+    @request_with_type(overseerr_type=MovieSearchResult, coalesce=True, budget="detail")
     async def get_movie_recommendations(
         self, id: int
     ) -> Union[MovieSearchResult, ErrorResponse]:
@@ -185,9 +481,13 @@ class OverseerrAPI:
             self._url + f"/movie/{id}/recommendations",
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=TVDetails)
+    @cached("tv")
+    @request_with_type(overseerr_type=TVDetails, coalesce=True, budget="detail")
     async def get_tv(self, id: int) -> Union[TVDetails, ErrorResponse]:
         """
         Get a TV show by ID.
@@ -198,10 +498,16 @@ class OverseerrAPI:
         :rtype: Union[TVDetails, ErrorResponse]
         """
         return await get(
-            self._url + f"/tv/{id}", headers=self._headers, cookies=self._cookies
+            self._url + f"/tv/{id}",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=TVDetails)
+    @cached("tv")
+    @request_with_type(overseerr_type=TVSeason, coalesce=True, budget="detail")
     async def get_tv_season(
         self, id: int, season: int
     ) -> Union[TVSeason, ErrorResponse]:
@@ -219,9 +525,12 @@ class OverseerrAPI:
             self._url + f"/tv/{id}/season/{season}",
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=TVSearchResponse)
+    @request_with_type(overseerr_type=TVSearchResponse, coalesce=True, budget="detail")
     async def get_tv_recommendations(self, id: int):
         """
         Get TV show recommendations for a TV show by ID
@@ -235,9 +544,12 @@ class OverseerrAPI:
             self._url + f"/tv/{id}/recommendations",
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=Genre)
+    @request_with_type(overseerr_type=Genre, coalesce=True, budget="genres")
     async def _get_genre(self, media_type: MEDIA_TYPES) -> Union[List[Genre], ErrorResponse]:
         """
         Backing function for get_tv_genres and get_movie_genres. Don't use this directly.
@@ -253,9 +565,12 @@ class OverseerrAPI:
             self._url + f"/genres/{media_type}",
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=Genre)
+    @request_with_type(overseerr_type=Genre, coalesce=True, budget="genres")
     async def get_tv_genres(self) -> Union[Genre, ErrorResponse]:
         """
         Get all TV genres
@@ -264,10 +579,15 @@ class OverseerrAPI:
         :rtype: Union[Genre, ErrorResponse]
         """
         return await get(
-            self._url + f"/genres/tv", headers=self._headers, cookies=self._cookies
+            self._url + f"/genres/tv",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=Genre)
+    @request_with_type(overseerr_type=Genre, coalesce=True, budget="genres")
     async def get_movie_genres(self) -> Union[Genre, ErrorResponse]:
         """
         Get all movie genres
@@ -276,10 +596,15 @@ class OverseerrAPI:
         :rtype: Union[Genre, ErrorResponse]
         """
         return await get(
-            self._url + f"/genres/movie", headers=self._headers, cookies=self._cookies
+            self._url + f"/genres/movie",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=Request)
+    @request_with_type(overseerr_type=Request, budget="request")
     async def post_request(
         self, media_id: int, media_type: MediaTypes, user_id: Optional[int] = None, seasons: Union[List[int], Literal['all']] = "all"
     ) -> Union[Request, ErrorResponse]:
@@ -302,37 +627,114 @@ class OverseerrAPI:
             body.seasons = seasons
         if user_id:
             body.user_id = user_id
-        self._logger.debug("Request body: %s", body.to_json())
-        return await post(
+        log_payload(self._logger, logging.DEBUG, "Request body: %s", body)
+        res = await post(
             self._url + "/request",
             body=body.to_json(),
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
         )
+        if not isinstance(res, ErrorResponse):
+            # Cached details and search results still show the media as not requested
+            self.invalidate_media(media_type, media_id)
+        return res
 
-    @request_with_type(overseerr_type=Request)
+    @request_with_type(overseerr_type=Request, budget="approve")
     async def modify_request(
         self, id: int, status: Literal["approve", "decline"]
     ) -> Union[Request, ErrorResponse]:
         if status not in ["approve", "decline"]:
             raise RuntimeError(f"Invalid status {status}")
-        return await post(
-            self._url + f"/request/{id}/{status}", headers=self._headers_with_token
+        res = await post(
+            self._url + f"/request/{id}/{status}",
+            headers=self._headers_with_token,
+            session=self._session,
+            breaker=self._breaker,
         )
+        self._request_moderated(res)
+        return res
 
-    @request_with_type(overseerr_type=Request)
+    @request_with_type(overseerr_type=Request, budget="approve")
     async def deny_request(self, id: int) -> Union[Request, ErrorResponse]:
-        return await post(
-            self._url + f"/request/{id}/decline", headers=self._headers_with_token
+        res = await post(
+            self._url + f"/request/{id}/decline",
+            headers=self._headers_with_token,
+            session=self._session,
+            breaker=self._breaker,
         )
+        self._request_moderated(res)
+        return res
 
-    @request_with_type(overseerr_type=Request)
+    @request_with_type(overseerr_type=Request, budget="approve")
     async def approve_request(self, id: int) -> Union[Request, ErrorResponse]:
-        return await post(
-            self._url + f"/request/{id}/approve", headers=self._headers_with_token
+        res = await post(
+            self._url + f"/request/{id}/approve",
+            headers=self._headers_with_token,
+            session=self._session,
+            breaker=self._breaker,
         )
+        self._request_moderated(res)
+        return res
 
-    @request_with_type(overseerr_type=Requests)
+    def _request_moderated(self, res: Union[Dict, ErrorResponse]) -> None:
+        """
+        Drop the cached details and search pages showing the old status of a request's media.
+        This is intended for internal use only.
+
+        :param res: The undecoded request, or an error
+        """
+        if isinstance(res, ErrorResponse):
+            return
+        media = res.get("media") or {}
+        if media.get("mediaType") in MEDIA_TYPES and media.get("tmdbId"):
+            self.invalidate_media(media["mediaType"], media["tmdbId"])
+
+    async def moderate_requests(
+        self,
+        ids: Iterable[int],
+        status: Literal["approve", "decline"],
+        *,
+        concurrency: int = 4,
+        on_result: Optional[Callable[[BulkItemResult[Request]], Any]] = None,
+    ) -> BulkResult[Request]:
+        """
+        Approve or decline several requests, a few at a time. A request that fails doesn't stop the others.
+
+        :param ids: The IDs of the requests
+        :type ids: Iterable[int]
+        :param status: Either `"approve"` or `"decline"`
+        :type status: str
+        :param concurrency: The maximum number of calls in flight
+        :type concurrency: int
+        :param on_result: Called with the outcome of each request as soon as it is known, e.g. to report progress
+        :type on_result: Optional[Callable[[BulkItemResult], Any]]
+        :return: The outcome of every request, in the order of `ids`
+        :rtype: BulkResult
+        """
+        if status not in ["approve", "decline"]:
+            raise RuntimeError(f"Invalid status {status}")
+        call = self.approve_request if status == "approve" else self.deny_request
+        result = await run_bulk(ids, call, concurrency=concurrency, on_result=on_result)
+        self._logger.info(
+            "Bulk %s: %d succeeded, %d failed", status, len(result.succeeded), len(result.failed)
+        )
+        return result
+
+    async def approve_requests(self, ids: Iterable[int], **kwargs: Any) -> BulkResult[Request]:
+        """
+        Approve several requests. See `moderate_requests`.
+        """
+        return await self.moderate_requests(ids, "approve", **kwargs)
+
+    async def deny_requests(self, ids: Iterable[int], **kwargs: Any) -> BulkResult[Request]:
+        """
+        Decline several requests. See `moderate_requests`.
+        """
+        return await self.moderate_requests(ids, "decline", **kwargs)
+
+    @request_with_type(overseerr_type=Requests, coalesce=True, budget="requests")
     async def get_all_requests(
         self,
         *,
@@ -375,14 +777,162 @@ class OverseerrAPI:
             params=params,
             headers=self._headers,
             cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
         )
 
-    @request_with_type(overseerr_type=User)
+    @request_with_type(overseerr_type=User, coalesce=True, budget="users")
     async def _get_me(self) -> Union[User, ErrorResponse]:
         return await get(
-            self._url + "/auth/me", headers=self._headers, cookies=self._cookies
+            self._url + "/auth/me",
+            headers=self._headers,
+            cookies=self._cookies,
+            session=self._session,
+            breaker=self._breaker,
+            retry=self._retry,
+        )
+
+    def invalidate_media(self, media_type: MediaTypes, id: Optional[int] = None) -> int:
+        """
+        Drop cached details for a movie or TV show, including any cached TV seasons,
+        and the cached search pages listing it, as their `media_info` would be outdated.
+
+        :param media_type: Either `"movie"` or `"tv"`
+        :type media_type: str
+        :param id: The TMDB ID to invalidate. Drops every entry of `media_type` if omitted.
+        :type id: Optional[int]
+        :return: The number of cache entries removed
+        :rtype: int
+        """
+        removed = 0
+        if self._search_cache is not None:
+            removed += self._search_cache.invalidate_values_where(
+                # Indexed by JSON key, untyped results of the jsonobject backend have no `media_type`
+                lambda res: any(
+                    result["mediaType"] == media_type and (id is None or result["id"] == id)
+                    for result in res.results
+                )
+            )
+        if self._detail_cache is None:
+            return removed
+        if id is None:
+            return removed + self._detail_cache.invalidate_where(lambda k: k[0] == media_type)
+        return removed + self._detail_cache.invalidate_where(lambda k: k[:2] == (media_type, id))
+
+    @property
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Size and hit/miss counters of the detail cache, empty if caching is disabled.
+
+        :rtype: Dict[str, Any]
+        """
+        if self._detail_cache is None:
+            return {}
+        return self._detail_cache.stats
+
+    @property
+    def search_cache_stats(self) -> Dict[str, Any]:
+        """
+        Size and hit/miss counters of the search cache, empty if caching is disabled.
+
+        :rtype: Dict[str, Any]
+        """
+        if self._search_cache is None:
+            return {}
+        return self._search_cache.stats
+
+    @property
+    def circuit_state(self) -> CircuitStates:
+        """
+        `"closed"` while overseerr is reachable, `"open"` while calls fail fast, `"half_open"` while probing.
+
+        :rtype: str
+        """
+        return self._breaker.state
+
+    def is_stale(self, result: Any) -> bool:
+        """
+        Whether `result` came from the cache after it expired, because overseerr couldn't be reached.
+
+        :param result: A value returned by one of the cached endpoints
+        :rtype: bool
+        """
+        return any(
+            cache is not None and cache.is_stale(result)
+            for cache in (self._detail_cache, self._search_cache)
         )
 
+    def _collect_metrics(self) -> Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+        """
+        Export counters kept by the cache, circuit breaker, rate limiter and call coalescing. Run on every metrics scrape.
+        """
+        cache = self.cache_stats
+        if cache:
+            yield "overseerr_cache_lookups_total", "counter", "Detail cache lookups by result", [
+                ({"result": "hit"}, cache["hits"]),
+                ({"result": "miss"}, cache["misses"]),
+                ({"result": "stale"}, cache["stale_hits"]),
+            ]
+            yield "overseerr_cache_entries", "gauge", "Entries in the detail cache", [({}, cache["size"])]
+        cache = self.search_cache_stats
+        if cache:
+            yield "overseerr_search_cache_lookups_total", "counter", "Search cache lookups by result", [
+                ({"result": "hit"}, cache["hits"]),
+                ({"result": "miss"}, cache["misses"]),
+                ({"result": "stale"}, cache["stale_hits"]),
+            ]
+            yield "overseerr_search_cache_entries", "gauge", "Entries in the search cache", [({}, cache["size"])]
+        state = self.circuit_state
+        yield "overseerr_circuit_state", "gauge", "1 for the current circuit breaker state", [
+            ({"state": s}, float(s == state)) for s in ("closed", "open", "half_open")
+        ]
+        yield "overseerr_circuit_rejected_total", "counter", "Calls failed fast by the open circuit", [
+            ({}, self._breaker.rejected)
+        ]
+        yield "overseerr_coalesced_calls_total", "counter", "Calls that joined an identical call already in flight", [
+            ({}, self._inflight.shared)
+        ]
+        yield "overseerr_promoted_calls_total", "counter", "Coalesced calls re-issued for a more urgent caller", [
+            ({}, self._inflight.promoted)
+        ]
+        limits = self.rate_limit_stats["endpoints"]
+        yield "overseerr_ratelimit_waiting", "gauge", "Calls queued by the rate limiter", [
+            ({"endpoint": name}, stats["waiting"]) for name, stats in limits.items()
+        ]
+        yield "overseerr_ratelimit_in_flight", "gauge", "Calls admitted by the rate limiter and not yet finished", [
+            ({"endpoint": name}, stats["in_flight"]) for name, stats in limits.items()
+        ]
+        if self._retry.budget is not None:
+            yield "overseerr_retry_budget_exhausted_total", "counter", "Retries skipped for lack of retry budget", [
+                ({}, self._retry.budget.exhausted)
+            ]
+
+    @property
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, in-flight calls and wait times of the rate limiter, overall and per endpoint budget.
+
+        :rtype: Dict[str, Any]
+        """
+        return self._governor.stats
+
+    def priority(self, level: Priority) -> ContextManager[None]:
+        """
+        Queue the calls made within the returned context, including from tasks created in it, at `level`.
+        Interactive calls are the default and are served before prefetches, which are served before background work.
+
+        :param level: The priority to queue calls with
+        :type level: Priority
+        """
+        return priority(level)
+
+    def background(self) -> ContextManager[None]:
+        """
+        Queue the calls made within the returned context behind interactive ones, e.g. for periodic refreshes.
+        """
+        return self.priority(Priority.BACKGROUND)
+
     @property
     def _headers(self) -> Dict[str, str]:
         """
@@ -398,18 +948,47 @@ class OverseerrAPI:
         return dict(**self._headers, **{"X-Api-Key": self._api_key})
 
     @property
-    def _cookies(self):
-        return self.__cookies
+    def _session(self) -> ClientSession:
+        """
+        The pooled session, opened on first use. Don't use this directly.
+
+        :return: The shared HTTP session
+        :rtype: ClientSession
+        """
+        if self._http is None or self._http.closed:
+            self._http = create_session(**self._session_options)
+        return self._http
+
+    @property
+    def _cookies(self) -> Optional[Dict[str, str]]:
+        """
+        The session cookies, `None` if not logged in. Don't use this directly.
+        """
+        return self._auth.cookies
 
     @property
     def me(self) -> User:
+        """
+        The user the client is logged in as. Fetched by `start`, or by `get_me`.
+
+        :rtype: User
+        """
         if self._me is None:
-            self._me = asyncio.run(self._get_me())
+            raise RuntimeError("The current user isn't known yet, use `await client.get_me()`")
         return self._me
 
+    async def get_me(self) -> Union[User, ErrorResponse]:
+        """
+        Fetch the user the client is logged in as, once.
+
+        :return: The user, or an error
+        :rtype: Union[User, ErrorResponse]
+        """
+        if self._me is None:
+            me = await self._get_me()
+            if isinstance(me, ErrorResponse):
+                self._logger.error("Failed to fetch the current user: %s", me.message)
+                return me
+            self._me = me
+        return self._me
 
-def setup_logging():
-    logging.TRACE = 5
-    logging.addLevelName(logging.TRACE, "TRACE")
-    logging.Logger.trace = partialmethod(logging.Logger.log, logging.TRACE)
-    logging.trace = partial(logging.log, logging.TRACE)
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from http.cookies import SimpleCookie
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+import aiohttp
+
+from .exceptions import ForbiddenException
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SessionManager"]
+
+SESSION_FILE_VERSION = 1
+
+LOGINS = REGISTRY.counter(
+    "overseerr_logins_total",
+    "Logins with email and password, by why the session was (re)created",
+    ["reason"],
+)
+
+
+def _expiry(cookies: SimpleCookie) -> Optional[float]:
+    """The earliest expiry of the given cookies as a unix timestamp, `None` for session cookies"""
+    expiries = []
+    for morsel in cookies.values():
+        if morsel["max-age"]:
+            expiries.append(time.time() + int(morsel["max-age"]))
+        elif morsel["expires"]:
+            try:
+                expiries.append(parsedate_to_datetime(morsel["expires"]).timestamp())
+            except (TypeError, ValueError):
+                logger.debug("Ignoring unparsable expiry of cookie %s: %s", morsel.key, morsel["expires"])
+    return min(expiries, default=None)
+
+
+class SessionManager:
+    """
+    Keeps the session cookie of an email/password login, optionally persisted to disk so restarts reuse it.
+
+    Calls failing with `UnauthorizedException`, or a `ForbiddenException` while the session is no longer valid,
+    are recovered by logging in again. Concurrent failures share a single login, after which every caller
+    replays its call. A session about to expire is renewed in the background before any call fails.
+    This is intended for internal use only.
+
+    :param url: The overseerr API URL, persisted sessions of other servers are ignored
+    :param login: Coroutine function logging in and returning the session cookies, `None` if the client
+        has no credentials to log in with
+    :param verify: Coroutine function returning whether the current session cookies are still accepted
+    :param path: File the session is persisted to, `None` to keep it in memory only
+    :param renew_before: Seconds before the session expires it is renewed in the background
+    """
+
+    def __init__(
+        self,
+        url: str,
+        login: Optional[Callable[[], Awaitable[SimpleCookie]]],
+        verify: Callable[[], Awaitable[bool]],
+        *,
+        path: Optional[str] = None,
+        renew_before: float = 86400,
+    ) -> None:
+        self.url = url
+        self.path = path
+        self.renew_before = renew_before
+        self._login = login
+        self._verify = verify
+        self._lock = asyncio.Lock()
+        self._renewal: Optional[asyncio.Task] = None
+        self.cookies: Optional[Dict[str, str]] = None
+        self.expires_at: Optional[float] = None
+        # Bumped on every new session, so callers can tell whether a login happened since their call was sent
+        self.generation = 0
+
+    @property
+    def can_login(self) -> bool:
+        return self._login is not None
+
+    @property
+    def valid(self) -> bool:
+        """Whether there is a session cookie that hasn't expired yet"""
+        return self.cookies is not None and (self.expires_at is None or self.expires_at > time.time())
+
+    def update(self, cookies: Union[SimpleCookie, Dict[str, str]], expires_at: Optional[float] = None) -> None:
+        """
+        Use new session cookies. They are persisted by `persist`.
+
+        :param cookies: The cookies set by the login response
+        :param expires_at: Unix timestamp the session expires at, taken from the cookies if they are a `SimpleCookie`
+        """
+        if isinstance(cookies, SimpleCookie):
+            expires_at = _expiry(cookies)
+            cookies = {name: morsel.value for name, morsel in cookies.items()}
+        self.cookies = cookies
+        self.expires_at = expires_at
+        self.generation += 1
+
+    def clear(self) -> None:
+        self.cookies = None
+        self.expires_at = None
+        self.generation += 1
+
+    async def load(self) -> bool:
+        """
+        Reuse the session persisted by a previous run. The file is read in a worker thread.
+
+        :return: Whether a session for this server that hasn't expired yet was loaded
+        :rtype: bool
+        """
+        if self.path is None:
+            return False
+        data = await asyncio.to_thread(self._read)
+        if data is None:
+            return False
+        if data.get("version") != SESSION_FILE_VERSION or data.get("url") != self.url:
+            logger.info("Ignoring session file %s saved for another server or version", self.path)
+            return False
+        expires_at = data.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            logger.info("Persisted session expired at %s", datetime.fromtimestamp(expires_at))
+            return False
+        self.cookies = data["cookies"]
+        self.expires_at = expires_at
+        self.generation += 1
+        logger.debug("Loaded session persisted at %s", data.get("saved_at"))
+        return True
+
+    async def persist(self) -> None:
+        """Write the session to `path`, if one was given, in a worker thread"""
+        if self.path is None:
+            return
+        data = {
+            "version": SESSION_FILE_VERSION,
+            "url": self.url,
+            "saved_at": datetime.now().isoformat(),
+            "expires_at": self.expires_at,
+            "cookies": self.cookies,
+        }
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as e:
+            logger.warning("Failed to persist the session to %s: %s", self.path, e)
+
+    def _read(self) -> Optional[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.debug("No persisted session at %s", self.path)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable session file %s: %s", self.path, e)
+        return None
+
+    def _write(self, data: dict) -> None:
+        """Atomically write `data` to `path`, readable by the current user only"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        # mkstemp creates the file with mode 0600
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.debug("Persisted session to %s", self.path)
+
+    async def renew(self, generation: Optional[int] = None, reason: str = "login") -> bool:
+        """
+        Log in, unless another caller already did since `generation` was read.
+
+        :param generation: The `generation` the caller's failed call was sent with, `None` to always log in
+        :param reason: Why the session is renewed, for metrics
+        :return: Whether there is a new session to retry with
+        :rtype: bool
+        """
+        if self._login is None:
+            return False
+        async with self._lock:
+            if generation is not None and generation != self.generation:
+                return True
+            return await self._renew(reason)
+
+    async def _renew(self, reason: str) -> bool:
+        LOGINS.inc(reason=reason)
+        try:
+            self.update(await self._login())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Failed to log in: %s", e)
+            return False
+        await self.persist()
+        return True
+
+    async def recover(self, error: Exception, generation: int) -> bool:
+        """
+        Decide whether a call that failed with `error` should be replayed, logging in again first if needed.
+
+        :param error: The `UnauthorizedException` or `ForbiddenException` the call failed with
+        :param generation: The `generation` the call was sent with
+        :return: Whether to replay the call
+        :rtype: bool
+        """
+        if self._login is None:
+            return False
+        async with self._lock:
+            if generation != self.generation:
+                # Someone else logged in while the call was in flight
+                return True
+            # Overseerr also answers 403 if the user lacks a permission, which logging in again won't fix
+            if isinstance(error, ForbiddenException) and self.valid and await self._verify():
+                return False
+            logger.info("Session rejected by overseerr (%s), logging in again", error)
+            return await self._renew("rejected")
+
+    def renew_if_expiring(self) -> None:
+        """
+        Start renewing the session in the background if it expires within `renew_before` seconds,
+        so no call has to wait for the login.
+        """
+        if (
+            self._login is None
+            or self.expires_at is None
+            or self.expires_at - time.time() > self.renew_before
+            or (self._renewal is not None and not self._renewal.done())
+        ):
+            return
+        logger.debug("Session expires at %s, renewing it", datetime.fromtimestamp(self.expires_at))
+        self._renewal = asyncio.ensure_future(self.renew(self.generation, reason="expiring"))
+
+    async def close(self) -> None:
+        if self._renewal is not None and not self._renewal.done():
+            self._renewal.cancel()
+            try:
+                await self._renewal
+            except asyncio.CancelledError:
+                pass
+        self._renewal = None
@@ -0,0 +1,123 @@
+import logging
+import time
+from typing import Awaitable, Callable, Literal, TypeVar
+
+from .exceptions import CircuitOpenException
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CircuitBreaker", "CircuitStates"]
+
+T = TypeVar("T")
+
+CircuitStates = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while the upstream looks down.
+
+    Opens after `failure_threshold` consecutive failures. While open, calls raise `CircuitOpenException`
+    without being sent. After `reset_timeout` seconds up to `half_open_probes` calls are let through:
+    a success closes the circuit again, a failure re-opens it for another `reset_timeout`.
+    This is intended for internal use only.
+
+    :param failure_threshold: Consecutive failures that open the circuit
+    :param reset_timeout: Seconds to stay open before probing
+    :param half_open_probes: Calls let through at once while probing
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        if failure_threshold < 1:
+            raise RuntimeError(f"Invalid failure threshold: `{failure_threshold}`")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self._opened_at: float = 0.0
+        self._open = False
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitStates:
+        if not self._open:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def _admit(self) -> bool:
+        """Raise if the call may not be sent; return whether it is a probe"""
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and self._probes < self.half_open_probes:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        retry_in = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+        raise CircuitOpenException(
+            f"Overseerr looks unavailable, not retrying for {retry_in:.0f}s", retry_in
+        )
+
+    def _success(self, probe: bool) -> None:
+        if probe:
+            self._probes -= 1
+        if self._open:
+            logger.info("Circuit closed, overseerr is reachable again")
+        self._open = False
+        self.failures = 0
+
+    def _failure(self, probe: bool) -> None:
+        if probe:
+            self._probes -= 1
+        self.failures += 1
+        if probe or (not self._open and self.failures >= self.failure_threshold):
+            if not self._open:
+                self.opened += 1
+            logger.warning(
+                "Circuit opened after %d consecutive failures, failing fast for %.0fs",
+                self.failures,
+                self.reset_timeout,
+            )
+            self._open = True
+            self._opened_at = time.monotonic()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        is_failure: Callable[[BaseException], bool] = lambda e: isinstance(e, Exception),
+        is_failed_result: Callable[[T], bool] = lambda r: False,
+    ) -> T:
+        """
+        Run `fn` if the circuit allows it.
+
+        :param fn: Zero-argument coroutine function making the call
+        :param is_failure: Whether an exception raised by `fn` counts as the upstream failing
+        :param is_failed_result: Whether a value returned by `fn` counts as the upstream failing,
+            e.g. an error response
+        :return: The result of `fn`
+        """
+        probe = self._admit()
+        try:
+            result = await fn()
+        except BaseException as e:
+            if is_failure(e):
+                self._failure(probe)
+            elif probe:
+                # e.g. cancelled, or an error that says nothing about the upstream's health
+                self._probes -= 1
+            raise
+        if is_failed_result(result):
+            self._failure(probe)
+        else:
+            self._success(probe)
+        return result
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Generic, Iterable, List, Optional, TypeVar
+
+import aiohttp
+
+from ..types import ErrorResponse
+from .exceptions import CircuitOpenException
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["BulkItemResult", "BulkResult", "run_bulk"]
+
+T = TypeVar("T")
+
+
+class BulkItemResult(Generic[T]):
+    """
+    Outcome of one item of a bulk operation: the value returned for it, or why it failed.
+
+    :param id: The item the call was made for, e.g. a request ID
+    :param result: The value returned, `None` if the call failed
+    :param error: Why the call failed, `None` if it succeeded
+    """
+
+    __slots__ = ("id", "result", "error")
+
+    def __init__(self, id: int, result: Optional[T] = None, error: Optional[str] = None) -> None:
+        self.id = id
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BulkItemResult(id={self.id}, ok)"
+        return f"BulkItemResult(id={self.id}, error={self.error!r})"
+
+
+class BulkResult(Generic[T]):
+    """
+    Per-item outcomes of a bulk operation, in the order the items were given.
+    """
+
+    def __init__(self, items: List[BulkItemResult[T]]) -> None:
+        self.items = items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    @property
+    def succeeded(self) -> List[BulkItemResult[T]]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> List[BulkItemResult[T]]:
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every item succeeded"""
+        return all(item.ok for item in self.items)
+
+
+async def run_bulk(
+    ids: Iterable[int],
+    call: Callable[[int], Awaitable[Any]],
+    *,
+    concurrency: int = 4,
+    on_result: Optional[Callable[[BulkItemResult], Any]] = None,
+) -> BulkResult:
+    """
+    Call `call` for every id with at most `concurrency` calls in flight.
+    A failing item, whether by error response or exception, doesn't stop the others, and neither does
+    an exception raised by `on_result`.
+    This is intended for internal use only.
+
+    :param ids: The items to process
+    :param call: Coroutine function making the call for one id
+    :param concurrency: Maximum number of calls in flight
+    :param on_result: Called with each item's outcome as soon as it is known, e.g. to report progress
+    :return: The outcome of every item
+    """
+    if concurrency < 1:
+        raise RuntimeError(f"Invalid concurrency: `{concurrency}`")
+    ids = list(ids)
+    items: List[Optional[BulkItemResult]] = [None] * len(ids)
+    pending = iter(enumerate(ids))
+
+    async def worker() -> None:
+        for i, id in pending:
+            try:
+                res = await call(id)
+            except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenException) as e:
+                item = BulkItemResult(id, error=str(e) or type(e).__name__)
+            except Exception as e:
+                logger.exception("Bulk call for %d raised an unexpected error", id)
+                item = BulkItemResult(id, error=str(e) or type(e).__name__)
+            else:
+                if isinstance(res, ErrorResponse):
+                    item = BulkItemResult(id, error=res.message or f"HTTP {res.status}")
+                else:
+                    item = BulkItemResult(id, result=res)
+            if not item.ok:
+                logger.warning("Bulk call for %d failed: %s", id, item.error)
+            items[i] = item
+            if on_result is not None:
+                try:
+                    on_result(item)
+                except Exception:
+                    logger.exception("Reporting the outcome of bulk call for %d failed", id)
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(concurrency, len(ids))):
+            group.create_task(worker())
+    return BulkResult(items)
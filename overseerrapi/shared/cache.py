@@ -0,0 +1,141 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+__all__ = ["TTLCache"]
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded, time-expiring LRU cache. Entries expire `ttl` seconds after they are set,
+    and the least recently used entry is evicted once `maxsize` is reached.
+    Expired entries are kept for another `stale_ttl` seconds as a fallback, see `get_stale`.
+    This is intended for internal use only.
+    """
+
+    def __init__(self, *, ttl: float, maxsize: int = 256, stale_ttl: float = 0) -> None:
+        if ttl < 0 or stale_ttl < 0 or ttl + stale_ttl <= 0:
+            raise ValueError("ttl or stale_ttl must be positive")
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Keys whose value was last handed out by `get_stale`
+        self._served_stale: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is missing or expired.
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                self._discard(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key` even if it expired, as long as it is within `stale_ttl`.
+        Meant as a fallback when refreshing the value failed.
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING or entry[0] + self.stale_ttl <= time.monotonic():
+            return default
+        if entry[0] <= time.monotonic():
+            self._served_stale.add(key)
+            self.stale_hits += 1
+        return entry[1]
+
+    def is_stale(self, value: Any) -> bool:
+        """
+        Whether `value` was handed out by `get_stale` after it expired and hasn't been refreshed since.
+        """
+        return any(
+            key in self._data and self._data[key][1] is value
+            for key in self._served_stale
+        )
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        self._served_stale.discard(key)
+        while len(self._data) > self.maxsize:
+            evicted, _ = self._data.popitem(last=False)
+            self._served_stale.discard(evicted)
+
+    def _discard(self, key: Hashable) -> None:
+        del self._data[key]
+        self._served_stale.discard(key)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop a single entry.
+
+        :return: Whether an entry was removed
+        :rtype: bool
+        """
+        self._served_stale.discard(key)
+        return self._data.pop(key, _MISSING) is not _MISSING
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches `predicate`.
+
+        :return: The number of entries removed
+        :rtype: int
+        """
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    def invalidate_values_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Drop every entry whose value matches `predicate`, expired entries included.
+
+        :return: The number of entries removed
+        :rtype: int
+        """
+        keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._served_stale.clear()
+
+    @property
+    def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
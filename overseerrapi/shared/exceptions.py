@@ -4,11 +4,25 @@ Overseerr-related exceptions
 
 class UnauthorizedException(Exception):
     """
-    Raised when the provided user fails to authenticate.
+    Raised when the provided user fails to authenticate, e.g. because the session cookie expired.
+    `response` is the error overseerr returned.
     """
-    pass
+    def __init__(self, message: str = "Unauthorized", response=None) -> None:
+        super().__init__(message)
+        self.response = response
 class ForbiddenException(Exception):
     """
     Raised when the provided user does not have permission to perform an action.
+    Overseerr also answers with this when the session cookie is no longer valid.
+    `response` is the error overseerr returned.
     """
-    pass
\ No newline at end of file
+    def __init__(self, message: str = "Forbidden", response=None) -> None:
+        super().__init__(message)
+        self.response = response
+class CircuitOpenException(Exception):
+    """
+    Raised instead of sending a call while overseerr is considered unavailable.
+    """
+    def __init__(self, message: str, retry_in: float) -> None:
+        super().__init__(message)
+        self.retry_in = retry_in
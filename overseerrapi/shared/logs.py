@@ -0,0 +1,122 @@
+import json
+import logging
+import logging.handlers
+import random
+import sys
+from functools import partial, partialmethod
+from typing import Any, Optional, TextIO
+
+__all__ = [
+    "TRACE",
+    "Payload",
+    "DeferredQueueHandler",
+    "configure_payloads",
+    "log_payload",
+    "setup_logging",
+    "default_handler",
+]
+
+TRACE = 5
+
+# Characters of a payload rendered into a log message, and share of payload messages logged at all
+_payload_limit = 2000
+_payload_sample_rate = 1.0
+
+_default_handler: Optional[logging.Handler] = None
+
+
+def setup_logging() -> None:
+    """Register the TRACE level and `Logger.trace`. Safe to call more than once."""
+    logging.TRACE = TRACE
+    logging.addLevelName(TRACE, "TRACE")
+    logging.Logger.trace = partialmethod(logging.Logger.log, TRACE)
+    logging.trace = partial(logging.log, TRACE)
+
+
+def configure_payloads(limit: Optional[int] = None, sample_rate: Optional[float] = None) -> None:
+    """
+    Change how request and response bodies are logged by `log_payload`.
+
+    :param limit: Characters of a payload kept in the message, the rest is cut off. 0 for no limit.
+    :param sample_rate: Share of payload messages logged, between 0 and 1
+    """
+    global _payload_limit, _payload_sample_rate
+    if limit is not None:
+        _payload_limit = limit
+    if sample_rate is not None:
+        if not 0 <= sample_rate <= 1:
+            raise RuntimeError(f"Invalid payload sample rate: `{sample_rate}`")
+        _payload_sample_rate = sample_rate
+
+
+class Payload:
+    """
+    Renders a request or response body for a log message only when the message is formatted, truncated to the
+    configured limit. Dicts and lists are rendered as JSON, models through their `to_json`.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None) -> None:
+        self.value = value
+        self.limit = _payload_limit if limit is None else limit
+
+    def __str__(self) -> str:
+        value = self.value
+        to_json = getattr(value, "to_json", None)
+        if callable(to_json):
+            value = to_json()
+        if isinstance(value, (dict, list)):
+            text = json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = str(value)
+        if self.limit and len(text) > self.limit:
+            return f"{text[: self.limit]}... ({len(text) - self.limit} more characters)"
+        return text
+
+
+def log_payload(logger: logging.Logger, level: int, msg: str, *args: Any) -> None:
+    """
+    Log `msg` with every argument rendered as a `Payload`. Nothing is rendered, or even wrapped, unless
+    `level` is enabled for `logger` and the message is sampled.
+
+    :param logger: Logger to log to
+    :param level: Level to log at, usually TRACE
+    :param msg: %-style message
+    :param args: The payloads, e.g. a decoded response
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if _payload_sample_rate < 1 and random.random() >= _payload_sample_rate:
+        return
+    logger.log(level, msg, *(Payload(arg) for arg in args), stacklevel=2)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    `QueueHandler` that enqueues records as they are, so they are formatted, and their `Payload`s rendered,
+    by the handlers of the `QueueListener` on its thread rather than by the thread that logged them.
+    Only for queues read in the same process. Arguments are rendered later, so they must not be changed
+    after they were logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def default_handler(level: str = "INFO", stream: TextIO = sys.stderr) -> None:
+    """
+    Log the client's messages to `stream` if the application hasn't configured logging itself.
+    At most one handler is added, however many clients are created.
+    This is intended for internal use only.
+    """
+    global _default_handler
+    package = logging.getLogger(__name__.split(".")[0])
+    if _default_handler is not None or package.handlers or logging.getLogger().handlers:
+        return
+    _default_handler = logging.StreamHandler(stream)
+    _default_handler.setFormatter(
+        logging.Formatter("[%(asctime)s] [%(name)s - %(levelname)s] %(message)s")
+    )
+    _default_handler.setLevel(level.upper())
+    package.addHandler(_default_handler)
@@ -1,34 +1,210 @@
 import aiohttp
-import aiohttp.client_exceptions
 from ..types import ErrorResponse
 from ..types.load import load_error
-from typing import List, Optional, TypeVar, Dict, Union, Any
+from .retry import RetryPolicy, RetryableStatus, RETRY_STATUSES, parse_retry_after
+from .breaker import CircuitBreaker
+from .exceptions import ForbiddenException, UnauthorizedException
+from .metrics import REGISTRY
+from .logs import TRACE, log_payload
+from .ratelimit import admitted
+import asyncio
+import time
+from typing import Callable, List, Optional, TypeVar, Dict, Union, Any, AsyncIterator
+from contextlib import asynccontextmanager
 import json
 import urllib.parse
 import logging
 
-from json import JSONDecoder
+try:
+    import orjson
+except ImportError:  # optional, the standard library parser is used instead
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 R = TypeVar("R", Dict, List[Dict], ErrorResponse, aiohttp.ClientResponse)
 
-__all__ = ["get", "post", "put"]
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "overseerr_http_requests_in_flight", "HTTP requests to overseerr awaiting a response"
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "overseerr_http_request_duration_seconds",
+    "Time per HTTP request to overseerr, per attempt",
+    ["method"],
+)
+HTTP_RESPONSES = REGISTRY.counter(
+    "overseerr_http_responses",
+    "HTTP responses from overseerr by status, `error` for connection errors and timeouts",
+    ["method", "status"],
+)
 
+__all__ = ["get", "post", "put", "create_session", "set_json_decoder", "JSON_DECODERS"]
 
-def empty_string_to_none(values: Dict[str, Any]) -> Dict[str, Any]:
-    if isinstance(values, list):
-        for i, v in enumerate(values):
-            if not v:
-                values[i] = None
-    elif isinstance(values, dict):
-        for k in values:
-            if not values[k]:
-                values[k] = None
-    return values
+# Parsers taking the raw response body. Empty strings are handled by the models, see `types.normalize`.
+JSON_DECODERS: Dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+if orjson is not None:
+    JSON_DECODERS["orjson"] = orjson.loads
 
+DECODER: Callable[[bytes], Any] = JSON_DECODERS.get("orjson", json.loads)
 
-DECODER = JSONDecoder(object_hook=empty_string_to_none).decode
+
+def set_json_decoder(name: Optional[str] = None) -> str:
+    """
+    Choose the parser responses are decoded with, for every client.
+
+    :param name: One of `JSON_DECODERS`, `None` for the fastest one installed
+    :return: The name of the parser now in use
+    :rtype: str
+    """
+    global DECODER
+    if name is None:
+        name = "orjson" if "orjson" in JSON_DECODERS else "json"
+    if name not in JSON_DECODERS:
+        raise RuntimeError(f"Invalid JSON decoder: `{name}`, installed: {', '.join(JSON_DECODERS)}")
+    DECODER = JSON_DECODERS[name]
+    logger.debug("Decoding responses with %s", name)
+    return name
+
+
+def create_session(
+    *,
+    limit: int = 100,
+    limit_per_host: int = 10,
+    keepalive_timeout: float = 30,
+    ttl_dns_cache: Optional[int] = 300,
+    timeout: Optional[aiohttp.ClientTimeout] = None,
+) -> aiohttp.ClientSession:
+    """
+    Create a long-lived, connection-pooled session. Must be called from a running event loop.
+    Cookies set by responses aren't kept: the session cookie is only sent where it is passed explicitly,
+    see `SessionManager`.
+
+    :param limit: Total number of simultaneous connections
+    :param limit_per_host: Number of simultaneous connections to a single host
+    :param keepalive_timeout: Seconds an idle connection is kept open for reuse
+    :param ttl_dns_cache: Seconds DNS lookups are cached, `None` to cache forever
+    :param timeout: Default timeout for requests sent through the session
+    :return: The session
+    :rtype: aiohttp.ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout or aiohttp.ClientTimeout(total=30),
+        cookie_jar=aiohttp.DummyCookieJar(),
+    )
+
+
+async def _decode(r: aiohttp.ClientResponse) -> Any:
+    """
+    Parse the response body as JSON straight from the received bytes, `None` if it is empty.
+    Unlike `ClientResponse.json`, the body isn't copied into a str first, nor is the content type checked.
+    """
+    body = await r.read()
+    if not body:
+        return None
+    return DECODER(body)
+
+
+@asynccontextmanager
+async def _session_scope(
+    session: Optional[aiohttp.ClientSession],
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    Yield the shared session if one is given, otherwise a throwaway session that is closed on exit.
+    """
+    if session is not None and not session.closed:
+        yield session
+        return
+    async with aiohttp.ClientSession() as throwaway:
+        yield throwaway
+
+
+async def _read(r: aiohttp.ClientResponse, url: str) -> R:
+    """
+    Decode a response. Error statuses are returned as an ErrorResponse, or raised as `RetryableStatus`
+    if they are worth retrying. 401 and 403 are raised as `UnauthorizedException` and `ForbiddenException`
+    so the session can be renewed, see `SessionManager`.
+    """
+    logger.debug("Received response %d from %s", r.status, url)
+    if r.status < 400:
+        resp = await _decode(r)
+        log_payload(logger, TRACE, "Response: %s", resp)
+        return resp
+    try:
+        resp = load_error(await _decode(r))
+    except Exception as e:
+        # e.g. an HTML error page from a reverse proxy
+        logger.debug("Undecodable error response from %s: %s", url, e)
+        resp = ErrorResponse(message=f"{r.status} {r.reason}")
+    resp.status = r.status
+    if r.status == 401:
+        raise UnauthorizedException(resp.message or "Unauthorized", resp)
+    if r.status == 403:
+        raise ForbiddenException(resp.message or "Forbidden", resp)
+    if r.status in RETRY_STATUSES:
+        raise RetryableStatus(
+            r.status, parse_retry_after(r.headers.get("Retry-After")), resp
+        )
+    return resp
+
+
+def _is_outage(error: BaseException) -> bool:
+    """Whether an error suggests overseerr is down, as opposed to e.g. a bad request"""
+    if isinstance(error, RetryableStatus):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def _is_outage_response(resp: R) -> bool:
+    """Whether a response suggests overseerr is down, any 5xx status that wasn't retried"""
+    return isinstance(resp, ErrorResponse) and (resp.status or 0) >= 500
+
+
+async def _send(
+    method: str,
+    url: str,
+    *,
+    session: Optional[aiohttp.ClientSession],
+    retry: Optional[RetryPolicy],
+    breaker: Optional[CircuitBreaker] = None,
+    **kwargs,
+) -> R:
+    async def attempt() -> R:
+        async with admitted():
+            status = "error"
+            HTTP_IN_FLIGHT.inc()
+            start = time.perf_counter()
+            try:
+                async with _session_scope(session) as s:
+                    async with s.request(method, url, **kwargs) as r:
+                        status = r.status
+                        return await _read(r, url)
+            finally:
+                HTTP_IN_FLIGHT.dec()
+                HTTP_DURATION.observe(time.perf_counter() - start, method=method)
+                HTTP_RESPONSES.inc(method=method, status=status)
+
+    async def perform() -> R:
+        if retry is None:
+            return await attempt()
+        return await retry.run(attempt, f"{method} {url}")
+
+    try:
+        if breaker is None:
+            return await perform()
+        return await breaker.call(perform, is_failure=_is_outage, is_failed_result=_is_outage_response)
+    except RetryableStatus as e:
+        return e.response
+    except aiohttp.ClientConnectionError as cce:
+        logger.error("Error while requesting %s: %s", url, cce)
+        raise
 
 
 async def get(
@@ -37,33 +213,26 @@ async def get(
     params: Optional[Dict[str, str]] = None,
     headers: Optional[Dict[str, str]] = None,
     cookies: Optional[Any] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    retry: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
 ) -> R:
     logger.debug("Sending GET requests to %s", url)
-    logger.trace("Parameters: %s", params)
+    log_payload(logger, TRACE, "Parameters: %s", params)
     if params:
         params = "&".join(
             f"{k}={urllib.parse.quote(str(v))}" for k, v in params.items()
         )
         url = f"{url}?{params}"
-    async with aiohttp.ClientSession(headers=headers, cookies=cookies) as session:
-        async with session.get(url) as r:
-            try:
-                resp = await r.json(loads=DECODER)
-                logger.debug("Received response %d from %s", r.status, url)
-                logger.log(5, "Response: %s", resp)
-                r.raise_for_status()
-
-            except aiohttp.client_exceptions.ClientConnectionError as cce:
-                logger.error(f"Error while requesting %s: %s", url, cce)
-                logger.fatal(cce)
-
-            except aiohttp.client_exceptions.ClientResponseError as cre:
-                try:
-                    return load_error(resp)
-                except Exception as e:
-                    logger.error(f"Error while requesting %s: %s", url, cre)
-                    raise e
-            return resp
+    return await _send(
+        "GET",
+        url,
+        headers=headers,
+        cookies=cookies,
+        session=session,
+        retry=retry,
+        breaker=breaker,
+    )
 
 
 async def post(
@@ -73,25 +242,30 @@ async def post(
     headers: Optional[Dict[str, str]] = None,
     raw: bool = False,
     cookies: Optional[Any] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    breaker: Optional[CircuitBreaker] = None,
 ) -> R:
-    async with aiohttp.ClientSession(cookies=cookies, headers=headers) as session:
-        async with session.post(url, json=body) as r:
-            if raw:
+    if raw:
+        async with _session_scope(session) as session:
+            async with session.post(url, json=body, headers=headers, cookies=cookies) as r:
+                await r.read()
                 return r
-            try:
-                resp = await r.json(loads=DECODER)
-                logger.debug("Received response %d from %s", r.status, url)
-                r.raise_for_status()
-            except aiohttp.ClientResponseError as cre:
-                logger.error(f"Error while requesting %s: %s", url, cre)
-                try:
-                    resp = load_error(resp)
-                    for error in resp.errors:
-                        logger.error("Error response for %s: %s",  error.path, error.message)
-                except Exception as e:
-                    logger.error("Error while loading error response: %s", e)
-                    raise e from cre
-            return resp
+    # Not retried: creating or approving a request twice isn't harmless
+    resp = await _send(
+        "POST",
+        url,
+        json=body,
+        headers=headers,
+        cookies=cookies,
+        session=session,
+        retry=None,
+        breaker=breaker,
+    )
+    if isinstance(resp, ErrorResponse):
+        logger.error("Error while requesting %s: %s", url, resp.message)
+        for error in resp.errors:
+            logger.error("Error response for %s: %s", error.path, error.message)
+    return resp
 
 
 async def put(
@@ -99,17 +273,21 @@ async def put(
     *,
     body: Optional[Dict[str, str]] = None,
     headers: Optional[Dict[str, str]] = None,
+    cookies: Optional[Any] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    retry: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
 ) -> R:
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.put(url, json=body) as r:
-            try:
-                resp = await r.json(loads=DECODER)
-                r.raise_for_status()
-            except aiohttp.ClientResponseError as cre:
-                logger.error(f"Error while requesting %s: %s", url, cre)
-                try:
-                    return load_error(resp)
-                except Exception as e:
-                    logger.error("Error while loading error response: %s", e)
-                    raise e from cre
-            return resp
+    resp = await _send(
+        "PUT",
+        url,
+        json=body,
+        headers=headers,
+        cookies=cookies,
+        session=session,
+        retry=retry,
+        breaker=breaker,
+    )
+    if isinstance(resp, ErrorResponse):
+        logger.error("Error while requesting %s: %s", url, resp.message)
+    return resp
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, TypeVar
+
+from ..types import ErrorResponse
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["prefetch_pages"]
+
+P = TypeVar("P")
+
+
+def _check(page: Any, number: int) -> Any:
+    if isinstance(page, ErrorResponse):
+        raise RuntimeError(f"Error while fetching page {number}: {page.message}")
+    return page
+
+
+async def prefetch_pages(
+    fetch_page: Callable[[int], Awaitable[P]],
+    total_pages: Callable[[P], int],
+    *,
+    start: int = 1,
+    lookahead: int = 1,
+) -> AsyncIterator[P]:
+    """
+    Yield pages in order, keeping up to `lookahead` following pages in flight while the consumer works on the current one.
+    Pending fetches are cancelled if the consumer stops early.
+    This is intended for internal use only.
+
+    :param fetch_page: Coroutine function fetching a 1-indexed page number
+    :param total_pages: Reads the number of pages from a fetched page, e.g. from its PageInfo
+    :param start: The first page to fetch
+    :param lookahead: Number of pages to prefetch. `0` fetches each page only once the previous one was consumed.
+    :return: Pages, in order
+    """
+    first = _check(await fetch_page(start), start)
+    last = total_pages(first)
+    pending: Deque[asyncio.Task] = deque()
+    next_page = start + 1
+
+    def fill(depth: int) -> None:
+        nonlocal next_page
+        while len(pending) < depth and next_page <= last:
+            pending.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+
+    try:
+        fill(lookahead)
+        yield first
+        number = start
+        while True:
+            if not pending:
+                fill(1)
+                if not pending:
+                    return
+            page = await pending.popleft()
+            number += 1
+            fill(lookahead)
+            logger.debug("Yielding page %d of %d", number, last)
+            yield _check(page, number)
+    finally:
+        for task in pending:
+            task.cancel()
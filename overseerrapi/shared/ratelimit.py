@@ -0,0 +1,343 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Priority",
+    "TokenBucket",
+    "PrioritySemaphore",
+    "Governor",
+    "priority",
+    "current_priority",
+    "QueueState",
+    "track_queue",
+    "governed",
+    "admitted",
+    "DEFAULT_BUDGETS",
+]
+
+# Concurrent calls allowed per endpoint group, on top of the global limit
+DEFAULT_BUDGETS: Dict[str, int] = {
+    "search": 4,
+    "detail": 6,
+    "requests": 4,
+    "users": 4,
+    "genres": 2,
+    "request": 2,
+    "approve": 2,
+}
+
+
+WAIT_TIME = REGISTRY.histogram(
+    "overseerr_ratelimit_wait_seconds",
+    "Time calls to overseerr waited for the rate limiter",
+    ["endpoint", "priority"],
+)
+
+
+class Priority(IntEnum):
+    """
+    Lower values are served first when calls queue up.
+    """
+
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("overseerr_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """
+    Run the calls made in this block, and in tasks created from it, at `level`.
+
+    :param level: The priority to queue calls with
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """The priority calls made right now are queued with, see `priority`"""
+    return _priority.get()
+
+
+class QueueState:
+    """
+    Whether a call is waiting for the governor, see `track_queue`.
+    This is intended for internal use only.
+    """
+
+    __slots__ = ("waiting",)
+
+    def __init__(self) -> None:
+        self.waiting = False
+
+
+_queue_state: ContextVar[Optional[QueueState]] = ContextVar("overseerr_queue_state", default=None)
+
+
+@contextmanager
+def track_queue() -> Iterator[QueueState]:
+    """
+    Track whether the calls made in this block, and in tasks created from it, are waiting for the governor.
+    """
+    state = QueueState()
+    token = _queue_state.set(state)
+    try:
+        yield state
+    finally:
+        _queue_state.reset(token)
+
+
+_admission: ContextVar[Optional[Tuple["Governor", str]]] = ContextVar("overseerr_admission", default=None)
+
+
+@contextmanager
+def governed(governor: "Governor", endpoint: str) -> Iterator[None]:
+    """
+    Count the requests sent in this block against `endpoint` of `governor`, see `admitted`.
+
+    :param governor: The governor admitting the requests
+    :param endpoint: The budget the requests count against
+    """
+    token = _admission.set((governor, endpoint))
+    try:
+        yield
+    finally:
+        _admission.reset(token)
+
+
+@asynccontextmanager
+async def admitted() -> AsyncIterator[None]:
+    """
+    Hold a governor slot, and take a rate limit token, for one request if it is sent in a `governed` block.
+    Every attempt of a retried call is admitted on its own, so no slot is held while backing off.
+    """
+    admission = _admission.get()
+    if admission is None:
+        yield
+        return
+    governor, endpoint = admission
+    async with governor.limit(endpoint):
+        yield
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average, with bursts of up to `burst`.
+    Waiters are served by priority, then in arrival order.
+    This is intended for internal use only.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise RuntimeError(f"Invalid rate: `{rate}`")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated: Optional[float] = None
+        self._waiting: List[Tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._changed = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, level: int = Priority.INTERACTIVE) -> None:
+        """
+        Wait for a token.
+
+        :param level: Priority of the caller
+        """
+        loop = asyncio.get_running_loop()
+        entry = (level, next(self._counter))
+        async with self._changed:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    self._refill(loop.time())
+                    timeout = None
+                    if self._waiting[0] == entry:
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            return
+                        timeout = (1 - self._tokens) / self.rate
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                # The next waiter may now be at the head
+                self._changed.notify_all()
+
+
+class PrioritySemaphore:
+    """
+    Semaphore handing freed slots to the waiter with the lowest priority value, then in arrival order.
+    This is intended for internal use only.
+    """
+
+    def __init__(self, value: int) -> None:
+        if value < 1:
+            raise RuntimeError(f"Invalid concurrency: `{value}`")
+        self._value = value
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, level: int = Priority.INTERACTIVE) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (level, next(self._counter), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Handed a slot just as we were cancelled; pass it on
+                self.release()
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+
+class _EndpointStats:
+    __slots__ = ("calls", "in_flight", "waiting", "wait_total", "wait_max")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "wait_total": self.wait_total,
+            "wait_avg": self.wait_total / self.calls if self.calls else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+class Governor:
+    """
+    Bounds the calls made to overseerr: at most `max_concurrency` at once, at most `rate` per second,
+    and at most `budgets[endpoint]` at once per endpoint. Queued calls are admitted by priority,
+    see `priority`.
+    This is intended for internal use only.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        budgets: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._slots = PrioritySemaphore(max_concurrency)
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._budgets = {
+            endpoint: PrioritySemaphore(limit) for endpoint, limit in (budgets or {}).items()
+        }
+        self._endpoints: Dict[str, _EndpointStats] = {}
+
+    @asynccontextmanager
+    async def limit(self, endpoint: str) -> AsyncIterator[None]:
+        """
+        Hold a slot for one call to `endpoint` at the current priority.
+
+        :param endpoint: The budget the call counts against, e.g. `"search"` or `"detail"`
+        """
+        level = _priority.get()
+        queue_state = _queue_state.get()
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        budget = self._budgets.get(endpoint)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        stats.waiting += 1
+        if queue_state is not None:
+            queue_state.waiting = True
+        acquired: List[PrioritySemaphore] = []
+        try:
+            if budget is not None:
+                await budget.acquire(level)
+                acquired.append(budget)
+            await self._slots.acquire(level)
+            acquired.append(self._slots)
+            if self._bucket is not None:
+                await self._bucket.acquire(level)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            stats.waiting -= 1
+            if queue_state is not None:
+                queue_state.waiting = False
+        waited = loop.time() - start
+        WAIT_TIME.observe(waited, endpoint=endpoint, priority=level.name.lower())
+        stats.calls += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        if waited > 0.1:
+            logger.debug("Waited %.3fs for a %s slot at priority %s", waited, endpoint, level.name)
+        stats.in_flight += 1
+        try:
+            yield
+        finally:
+            stats.in_flight -= 1
+            for semaphore in acquired:
+                semaphore.release()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, in-flight calls and wait times, overall and per endpoint. Wait times are in seconds.
+        """
+        return {
+            "in_flight": sum(s.in_flight for s in self._endpoints.values()),
+            "waiting": sum(s.waiting for s in self._endpoints.values()),
+            "rate_limited": len(self._bucket) if self._bucket is not None else 0,
+            "endpoints": {name: s.as_dict() for name, s in self._endpoints.items()},
+        }
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+import aiohttp
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RetryPolicy", "RetryBudget", "RetryableStatus", "parse_retry_after"]
+
+T = TypeVar("T")
+
+# Statuses worth another try: rate limited, or a proxy/overseerr having a moment
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+RETRIES = REGISTRY.counter(
+    "overseerr_retries", "Retried calls to overseerr by what failed", ["reason"]
+)
+GIVE_UPS = REGISTRY.counter(
+    "overseerr_retry_give_ups",
+    "Calls that failed after retrying by why retrying stopped",
+    ["reason"],
+)
+
+
+class RetryableStatus(Exception):
+    """
+    Raised by an attempt that got a response worth retrying.
+    This is intended for internal use only.
+
+    :param status: The HTTP status
+    :param retry_after: Seconds the server asked us to wait, if it did
+    :param response: What to return if no retry is made
+    """
+
+    def __init__(self, status: int, retry_after: Optional[float], response: Any) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+        self.response = response
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait according to a `Retry-After` header, given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of calls, so an overseerr outage doesn't multiply the load on it.
+    Every call deposits `ratio` tokens up to `max_tokens`, every retry withdraws one.
+    This is intended for internal use only.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self._tokens < 1:
+            self.exhausted += 1
+            return False
+        self._tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Retries idempotent calls on connection errors, timeouts and the statuses in `RETRY_STATUSES`,
+    with exponential backoff and full jitter. A `Retry-After` header is honoured when it fits the deadline.
+
+    :param attempts: Maximum number of attempts, including the first
+    :param base_delay: Backoff before the first retry, doubled on every retry
+    :param max_delay: Upper bound on the backoff
+    :param deadline: Seconds a call may take across all attempts and backoffs, `None` for no deadline
+    :param budget: Shared retry budget, `None` for unbudgeted retries
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 5.0,
+        deadline: Optional[float] = 15.0,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        if attempts < 1:
+            raise RuntimeError(f"Invalid number of attempts: `{attempts}`")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.budget = budget
+        self.retries = 0
+
+    def backoff(self, retry: int) -> float:
+        """Full jitter: uniformly between 0 and the exponential backoff for the `retry`-th retry"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+    async def run(self, attempt: Callable[[], Awaitable[T]], description: str = "call") -> T:
+        """
+        Run `attempt` until it succeeds or retrying is no longer allowed.
+
+        :param attempt: Zero-argument coroutine function making one attempt. Raises `RetryableStatus`
+            for responses worth retrying.
+        :param description: Used in log messages, e.g. the URL
+        :return: The result of the successful attempt. The error of the last attempt is raised otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        expires = None if self.deadline is None else loop.time() + self.deadline
+        if self.budget is not None:
+            self.budget.deposit()
+        retry = 0
+        while True:
+            try:
+                async with asyncio.timeout_at(expires):
+                    return await attempt()
+            except (RetryableStatus, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay, reason = self._next_delay(e, retry, expires, loop.time())
+                if delay is None:
+                    logger.warning("Giving up on %s after %d attempt(s), out of %s: %s", description, retry + 1, reason, e)
+                    GIVE_UPS.inc(reason=reason)
+                    raise
+                retry += 1
+                self.retries += 1
+                RETRIES.inc(reason=str(e.status) if isinstance(e, RetryableStatus) else type(e).__name__)
+                logger.info("Retrying %s in %.2fs (attempt %d of %d): %s", description, delay, retry + 1, self.attempts, e)
+                await asyncio.sleep(delay)
+
+    def _next_delay(
+        self, error: Exception, retry: int, expires: Optional[float], now: float
+    ) -> Tuple[Optional[float], str]:
+        if retry + 1 >= self.attempts:
+            return None, "attempts"
+        delay = self.backoff(retry)
+        if isinstance(error, RetryableStatus) and error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        if expires is not None and now + delay >= expires:
+            return None, "deadline"
+        if self.budget is not None and not self.budget.withdraw():
+            return None, "budget"
+        return delay, ""
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from .ratelimit import Priority, QueueState, current_priority, track_queue
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SingleFlight"]
+
+
+class _Flight:
+    """One coalesced call: its attempts, the priority of the most urgent one, and the result they race for"""
+
+    __slots__ = ("result", "attempts", "level", "queue", "waiters")
+
+    def __init__(self, level: Priority) -> None:
+        self.result: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.attempts: List[asyncio.Task] = []
+        self.level = level
+        self.queue: Optional[QueueState] = None
+        self.waiters = 0
+
+    @property
+    def queued(self) -> bool:
+        """Whether the most urgent attempt is still waiting for the governor"""
+        return self.queue is not None and self.queue.waiting
+
+    def attempt(self, fn: Callable[[], Awaitable[Any]], level: Priority) -> None:
+        # Tasks copy the current context, so the attempt is queued at the caller's priority
+        with track_queue() as queue:
+            task = asyncio.ensure_future(fn())
+        task.add_done_callback(self._settle)
+        self.attempts.append(task)
+        self.level = level
+        self.queue = queue
+
+    def _settle(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            if not self.result.done() and all(t.done() for t in self.attempts):
+                self.result.cancel()
+            return
+        # Mark the exception retrieved in case every caller was cancelled before it finished
+        error = task.exception()
+        if self.result.done():
+            return
+        if error is not None:
+            self.result.set_exception(error)
+        else:
+            self.result.set_result(task.result())
+        self.cancel()
+
+    def cancel(self) -> None:
+        for task in self.attempts:
+            task.cancel()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+    Every caller awaiting the same key receives the same result (or exception).
+
+    A caller joining a call that is still queued at a lower priority, e.g. a click waiting for a prefetch,
+    re-issues it at its own priority so it isn't stuck behind other speculative calls. Both attempts race
+    and the first to finish answers everyone. Calls already sent are joined as they are.
+    This is intended for internal use only.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.shared = 0
+        self.promoted = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` unless a call with the same key is already in flight, in which case wait on that call instead.
+
+        :param key: Identifies the call, e.g. method name and arguments
+        :param fn: Zero-argument coroutine function performing the call
+        :return: The shared result
+        """
+        level = current_priority()
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = self._inflight[key] = _Flight(level)
+            flight.result.add_done_callback(lambda _: self._done(key, flight))
+            flight.attempt(fn, level)
+        else:
+            self.shared += 1
+            logger.debug("Joining in-flight call for %s", key)
+            if level < flight.level and flight.queued:
+                self.promoted += 1
+                logger.debug("Re-issuing in-flight call for %s at priority %s", key, level.name)
+                flight.attempt(fn, level)
+        flight.waiters += 1
+        try:
+            # Shielded so one caller being cancelled doesn't cancel the call for everyone else
+            return await asyncio.shield(flight.result)
+        except asyncio.CancelledError:
+            # ...but nobody is left waiting once the last caller is cancelled
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                flight.cancel()
+            raise
+
+    def _done(self, key: Hashable, flight: _Flight) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not flight.result.cancelled():
+            flight.result.exception()
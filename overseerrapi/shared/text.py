@@ -0,0 +1,16 @@
+import re
+import unicodedata
+
+__all__ = ["normalize_query"]
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(value: str) -> str:
+    """
+    Fold a search query so spellings that overseerr treats alike compare equal:
+    casefolded, diacritics stripped and whitespace collapsed.
+    """
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SPACES.sub(" ", stripped).strip()
@@ -1,20 +1,40 @@
+import asyncio
 import logging
-from typing import Any, Awaitable, Union
+import time
+import aiohttp
+from typing import Any, Awaitable, Callable, Optional, Tuple, Union
 from functools import wraps
 from ..types import _load_type as load_type, ErrorResponse
+from .exceptions import CircuitOpenException, ForbiddenException, UnauthorizedException
+from .metrics import REGISTRY
+from .logs import TRACE, log_payload
+from .ratelimit import governed
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["_request_with_type"]
+__all__ = ["_request_with_type", "_cached"]
 
+CALL_DURATION = REGISTRY.histogram(
+    "overseerr_call_duration_seconds",
+    "Time per client call, including rate limiting and retries but not model loading",
+    ["endpoint"],
+)
+CALL_ERRORS = REGISTRY.counter(
+    "overseerr_call_errors", "Client calls that raised or returned an error", ["endpoint"]
+)
 
-def _request_with_type(overseerr_type, raise_for_error=False):
+
+def _request_with_type(overseerr_type, raise_for_error=False, coalesce=False, budget=None):
     """
     Generic request wrapper for overseerr types. This will load the response into the given type provided in `overseerr_type`.
+    If the session was rejected, the call is replayed once after logging in again, see `SessionManager`.
     This is intended for internal use only.
 
     :param overseerr_type: The type to load the response into.
     :param raise_for_error: Whether or not to raise an exception if the response is an error.
+    :param coalesce: Whether concurrent calls with the same arguments share one in-flight request and loaded result.
+        Only use this for idempotent (GET) endpoints.
+    :param budget: The rate limiter budget the call counts against. Defaults to the method name.
     :return: The loaded type.
     :rtype: Union[ErrorResponse, overseerr_type]
 
@@ -23,18 +43,116 @@ def _request_with_type(overseerr_type, raise_for_error=False):
     def _request(f: Awaitable) -> Union[ErrorResponse, overseerr_type]:
         @wraps(f)
         async def wrapper(*args, **kwargs):
-            res = await f(*args, **kwargs)
+            flight = getattr(args[0], "_inflight", None) if args else None
+            if not coalesce or flight is None:
+                return await _load(*args, **kwargs)
+            key = (f.__name__, *args[1:], *sorted(kwargs.items()))
+            return await flight.do(key, lambda: _load(*args, **kwargs))
+
+        async def _call(*args, **kwargs):
+            governor = getattr(args[0], "_governor", None) if args else None
+            if governor is None:
+                return await f(*args, **kwargs)
+            # Each request the call sends is admitted by the governor, see `admitted`
+            with governed(governor, budget or f.__name__):
+                return await f(*args, **kwargs)
+
+        async def _authenticated(*args, **kwargs):
+            auth = getattr(args[0], "_auth", None) if args else None
+            if auth is None:
+                return await _call(*args, **kwargs)
+            auth.renew_if_expiring()
+            generation = auth.generation
+            try:
+                return await _call(*args, **kwargs)
+            except (UnauthorizedException, ForbiddenException) as e:
+                # Logged in outside of the governor, so waiting on the login doesn't hold up other calls
+                if not await auth.recover(e, generation):
+                    return e.response
+            logger.info("Replaying %s with the renewed session", f.__name__)
+            try:
+                return await _call(*args, **kwargs)
+            except (UnauthorizedException, ForbiddenException) as e:
+                return e.response
+
+        async def _load(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                res = await _authenticated(*args, **kwargs)
+            except Exception:
+                CALL_ERRORS.inc(endpoint=f.__name__)
+                raise
+            finally:
+                CALL_DURATION.observe(time.perf_counter() - start, endpoint=f.__name__)
 
             if isinstance(res, ErrorResponse):
+                CALL_ERRORS.inc(endpoint=f.__name__)
                 if raise_for_error:
                     raise RuntimeError(res.message)
                 return res
             logger.debug("Loading type %s", overseerr_type.__name__)
-            data = load_type(json_data=res, overseerr_type=overseerr_type)
+            backend = getattr(args[0], "_model_backend", "lazy") if args else "lazy"
+            data = load_type(json_data=res, overseerr_type=overseerr_type, backend=backend)
             logger.debug("Loaded type %s", overseerr_type.__name__)
-            logger.log(5, "Data: %s", data)
+            log_payload(logger, TRACE, "Data: %s", data)
             return data
 
         return wrapper
 
     return _request
+
+
+def _cached(
+    namespace: str,
+    *,
+    cache: str = "_detail_cache",
+    key: Optional[Callable[..., Tuple]] = None,
+):
+    """
+    Cache the result of a client method in the client's `_detail_cache`, keyed by `namespace` and the call arguments.
+    Caching is skipped when the client has no cache configured, and error responses are never cached.
+    If the call fails because overseerr is unavailable, an expired entry is returned instead if the cache kept one.
+    This is intended for internal use only.
+
+    :param namespace: Key prefix for the cached entries, e.g. the media type.
+    :param cache: Name of the client attribute holding the cache
+    :param key: Builds the rest of the key from the call arguments, instead of using them as is
+    :return: The cached or freshly loaded result.
+    """
+
+    def _cache(f: Awaitable):
+        @wraps(f)
+        async def wrapper(self, *args, **kwargs):
+            store = getattr(self, cache, None)
+            if store is None:
+                return await f(self, *args, **kwargs)
+            if key is None:
+                cache_key = (namespace, *args, *sorted(kwargs.items()))
+            else:
+                cache_key = (namespace, *key(*args, **kwargs))
+            res = store.get(cache_key)
+            if res is not None:
+                logger.debug("Cache hit for %s", cache_key)
+                return res
+            try:
+                res = await f(self, *args, **kwargs)
+            except (CircuitOpenException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return _stale_or_raise(store, cache_key, e)
+            if isinstance(res, ErrorResponse):
+                if (res.status or 0) >= 500:
+                    return store.get_stale(cache_key, res)
+                return res
+            store.set(cache_key, res)
+            return res
+
+        return wrapper
+
+    return _cache
+
+
+def _stale_or_raise(cache, key, error: Exception) -> Any:
+    stale = cache.get_stale(key)
+    if stale is None:
+        raise error
+    logger.warning("Serving stale %s: %s", key, error)
+    return stale
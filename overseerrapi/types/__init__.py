@@ -22,11 +22,13 @@ from .movie import MovieDetails, MovieResult, MovieSearchResult
 from .tv import TvResult, TVDetails, TVEpisode, TVSeason, TVSearchResponse
 from .search import MediaSearchResult, UserSearchResult
 from .error import ErrorResponse
-from .user import User
+from .user import User, UsersSortOpts, USERS_SORT_OPTS
 from .load import load_json as _load_type
 from .requests import Requests, Request, RequestCount, RequestBody, RequestsFilterByOpts, RequestsSortOpts, REQUESTS_FILTER_OPTS, REQUESTS_SORT_OPTS
 from .genre import Genre, Genres
 from .shared import PageInfo
+from .slots import model_of, is_model, ModelBackends, MODEL_BACKENDS
+from .webhook import WebhookPayload, WebhookMedia, WebhookRequest, WebhookNotificationTypes, WEBHOOK_NOTIFICATION_TYPES
 
 
 __all__ = [
@@ -38,6 +40,8 @@ __all__ = [
     "MediaInfo",
     "ErrorResponse",
     "User",
+    "UsersSortOpts",
+    "USERS_SORT_OPTS",
     "RequestBody",
     "Request",
     "Requests",
@@ -68,5 +72,14 @@ __all__ = [
     "RelatedVideo",
     "CreatedBy",
     "PageInfo",
+    "model_of",
+    "is_model",
+    "ModelBackends",
+    "MODEL_BACKENDS",
+    "WebhookPayload",
+    "WebhookMedia",
+    "WebhookRequest",
+    "WebhookNotificationTypes",
+    "WEBHOOK_NOTIFICATION_TYPES",
     "_load_type",
 ]
@@ -7,5 +7,6 @@ class OverseerrError(jsonobject.JsonObject):
 
 
 class ErrorResponse(jsonobject.JsonObject):
+    status = jsonobject.IntegerProperty(name="status")
     message = jsonobject.StringProperty(name="message")
     errors = jsonobject.ListProperty(lambda: OverseerrError, name="errors")
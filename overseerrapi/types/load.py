@@ -2,13 +2,23 @@ from jsonobject import JsonArray, JsonObject
 from typing import Union, TypeVar, List, Dict
 
 from .error import ErrorResponse
+from .slots import slotted
+from .normalize import normalize_blanks
 
 
 T = TypeVar("T", bound=[JsonArray, JsonObject])
 J = TypeVar("J", List[Dict], Dict)
 
 
-def load_json(*, json_data: J, overseerr_type: T) -> T:
+def load_json(*, json_data: J, overseerr_type: T, backend: str = "jsonobject") -> T:
+    if backend in ("slots", "lazy"):
+        loader = slotted(overseerr_type, lazy=backend == "lazy").from_json
+        if isinstance(json_data, list):
+            return [loader(i) for i in json_data]
+        return loader(json_data)
+    # The slotted models handle empty strings as they load each field. jsonobject accepts them for string
+    # properties, so the data has to be walked upfront.
+    normalize_blanks(overseerr_type, json_data)
     if isinstance(json_data, list):
         return [overseerr_type.wrap(i) for i in json_data]
     return overseerr_type(json_data)
@@ -0,0 +1,88 @@
+"""
+Overseerr sends empty strings for some missing values, e.g. the release date of an unreleased movie
+or the overview of a title nobody described yet. They are read as `None`, as for a missing key, when the
+model is loaded instead of for every decoded JSON object.
+"""
+from typing import Any, Dict, List, Tuple
+
+import jsonobject
+
+
+__all__ = ["BLANK_AS_NONE", "blank_as_none", "normalize_blanks"]
+
+# Properties an empty string is read as `None` for. Strings too: Discord rejects empty embed values.
+BLANK_AS_NONE = (
+    jsonobject.StringProperty,
+    jsonobject.IntegerProperty,
+    jsonobject.FloatProperty,
+    jsonobject.DecimalProperty,
+    jsonobject.BooleanProperty,
+    jsonobject.DateProperty,
+    jsonobject.DateTimeProperty,
+    jsonobject.TimeProperty,
+    jsonobject.ObjectProperty,
+    jsonobject.ListProperty,
+)
+
+# Per model: (JSON key, nested model of an object property, nested model of a list property's items)
+_Plan = Tuple[Tuple[str, Any, Any], ...]
+_PLANS: Dict[type, _Plan] = {}
+
+
+def blank_as_none(prop: jsonobject.JsonProperty) -> bool:
+    return isinstance(prop, BLANK_AS_NONE)
+
+
+def _typed(model: Any) -> Any:
+    """The model if it declares properties, `None` for untyped objects that are kept as decoded"""
+    return model if getattr(model, "_properties_by_attr", None) else None
+
+
+def _plan(model: type) -> _Plan:
+    plan = _PLANS.get(model)
+    if plan is not None:
+        return plan
+    steps = []
+    for prop in model._properties_by_attr.values():
+        if not blank_as_none(prop):
+            continue
+        nested = items = None
+        if isinstance(prop, jsonobject.ObjectProperty):
+            nested = _typed(prop.item_type)
+        elif isinstance(prop, jsonobject.ListProperty) and isinstance(
+            prop.item_wrapper, jsonobject.ObjectProperty
+        ):
+            items = _typed(prop.item_wrapper.item_type)
+        steps.append((prop.name, nested, items))
+    plan = _PLANS[model] = tuple(steps)
+    return plan
+
+
+def normalize_blanks(model: type, data: Any) -> Any:
+    """
+    Replace empty strings by `None`, in place, where `model` declares a property,
+    including in nested objects. Only the declared properties are visited.
+    This is intended for internal use only.
+
+    :param model: The jsonobject model `data` is loaded as
+    :param data: A decoded JSON object, or a list of them
+    :return: `data`
+    """
+    if isinstance(data, list):
+        for item in data:
+            normalize_blanks(model, item)
+        return data
+    if not isinstance(data, dict):
+        return data
+    for key, nested, items in _plan(model):
+        value = data.get(key)
+        if value is None:
+            continue
+        if value == "":
+            data[key] = None
+        elif nested is not None:
+            normalize_blanks(nested, value)
+        elif items is not None and type(value) is list:
+            for item in value:
+                normalize_blanks(items, item)
+    return data
@@ -4,14 +4,36 @@ import jsonobject
 from .shared import PageInfo
 from .tv import TvResult, TVDetails
 from .movie import MovieResult, MovieDetails
+from .media import PersonResult
 from .user import User
+from .normalize import normalize_blanks
 
 
 class MediaResult(jsonobject.JsonObject):
+    """
+    A movie, tv or person search result. Loaded as `MovieResult`, `TvResult` or `PersonResult` by its `mediaType`,
+    other results are kept untyped.
+    """
     _type = (MovieResult, MovieDetails,TvResult, TVDetails)
     def __init__(self, *args, **kwargs):
         super(jsonobject.JsonObject, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def wrap(cls, obj):
+        concrete = MEDIA_RESULT_TYPES.get(obj.get("mediaType")) if cls is MediaResult else None
+        if concrete is not None:
+            # Not reached by the walk of the enclosing model, which only knows this untyped declaration
+            return concrete.wrap(normalize_blanks(concrete, obj))
+        return super(MediaResult, cls).wrap(obj)
+
+
+# The concrete model of a search result by its `mediaType`, shared by every model backend
+MEDIA_RESULT_TYPES = {
+    "movie": MovieResult,
+    "tv": TvResult,
+    "person": PersonResult,
+}
+
 
 class MediaSearchResult(jsonobject.JsonObject):
     page = jsonobject.IntegerProperty(name="page")
@@ -0,0 +1,238 @@
+"""
+Lightweight `__slots__` model backends.
+
+Classes are generated from the property declarations of the jsonobject models, so the declarations in
+`overseerrapi.types` stay the single source of truth. Generated models skip jsonobject's validation and
+copying; numbers are kept as decoded and only dates are parsed. Empty strings are read as `None`,
+see `normalize`.
+
+The lazy variant keeps nested objects, lists and dates as decoded until the attribute is first read,
+then converts and caches the value on the instance.
+"""
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type, get_args
+
+import jsonobject
+
+from .search import MediaResult, MEDIA_RESULT_TYPES
+from .normalize import blank_as_none
+
+
+__all__ = ["slotted", "model_of", "is_model", "ModelBackends", "MODEL_BACKENDS"]
+
+ModelBackends = Literal["jsonobject", "slots", "lazy"]
+MODEL_BACKENDS = get_args(ModelBackends)
+
+Converter = Optional[Callable[[Any], Any]]
+
+_SLOTTED: Dict[Tuple[type, bool], type] = {}
+
+_PARSED_PROPERTIES = (
+    jsonobject.DateProperty,
+    jsonobject.DateTimeProperty,
+    jsonobject.TimeProperty,
+)
+
+
+class SlottedModel:
+    """
+    Base class of generated models. Supports attribute access like the jsonobject models,
+    and item access by JSON key for code that indexes them like dicts.
+    """
+
+    __slots__ = ()
+    __model__: type = None
+    # (attribute, JSON key, converter, default, whether an empty string is missing)
+    _fields: Tuple[Tuple[str, str, Converter, Converter, bool], ...] = ()
+    _attr_by_key: Dict[str, str] = {}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]):
+        obj = cls.__new__(cls)
+        for attr, key, convert, default, blank in cls._fields:
+            value = data.get(key)
+            if value is None or (blank and value == ""):
+                value = default and default()
+            elif convert is not None:
+                value = convert(value)
+            setattr(obj, attr, value)
+        return obj
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, self._attr_by_key[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{attr}={getattr(self, attr)!r}" for attr in self._attr_by_key.values()
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class _Raw:
+    """Marks a slot value that hasn't been converted yet"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class _LazyField:
+    """
+    Descriptor converting the raw value stored in a hidden slot on first access.
+    """
+
+    __slots__ = ("slot", "convert", "default")
+
+    def __init__(self, convert: Converter, default: Converter) -> None:
+        self.slot = None
+        self.convert = convert
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if type(value) is _Raw:
+            raw = value.value
+            # Only properties empty strings are read as `None` for are deferred
+            if raw is None or raw == "":
+                value = self.default and self.default()
+            else:
+                value = self.convert(raw) if self.convert is not None else raw
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value) -> None:
+        self.slot.__set__(obj, value)
+
+
+class LazySlottedModel(SlottedModel):
+    __slots__ = ()
+    _lazy_fields: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]):
+        obj = cls.__new__(cls)
+        for attr, key, _, _, blank in cls._fields:
+            value = data.get(key)
+            setattr(obj, attr, None if blank and value == "" else value)
+        for slot, key in cls._lazy_fields:
+            setattr(obj, slot, _Raw(data.get(key)))
+        return obj
+
+
+def _object_converter(model: type, lazy: bool) -> Converter:
+    if model is MediaResult:
+
+        def media_result(data: Dict[str, Any]) -> Any:
+            concrete = MEDIA_RESULT_TYPES.get(data.get("mediaType"))
+            if concrete is None:
+                return data
+            return slotted(concrete, lazy=lazy).from_json(data)
+
+        return media_result
+    if not model._properties_by_attr:
+        # Untyped objects, e.g. the watch provider entries, are kept as decoded
+        return None
+    return lambda data: slotted(model, lazy=lazy).from_json(data)
+
+
+def _item_converter(prop: jsonobject.JsonProperty, lazy: bool) -> Converter:
+    if isinstance(prop, jsonobject.ObjectProperty):
+        return _object_converter(prop.item_type, lazy)
+    if isinstance(prop, _PARSED_PROPERTIES):
+        return prop.wrap
+    return None
+
+
+def _converter(prop: jsonobject.JsonProperty, lazy: bool) -> Converter:
+    if isinstance(prop, jsonobject.ListProperty):
+        item = prop.item_wrapper and _item_converter(prop.item_wrapper, lazy)
+        if item is None:
+            return None
+        return lambda values: [None if v is None else item(v) for v in values]
+    return _item_converter(prop, lazy)
+
+
+def _default(prop: jsonobject.JsonProperty, lazy: bool) -> Converter:
+    """Missing lists and objects default to empty ones, as they do with jsonobject"""
+    if isinstance(prop, jsonobject.ListProperty):
+        return list
+    if isinstance(prop, jsonobject.ObjectProperty):
+        model = prop.item_type
+        if not model._properties_by_attr:
+            return dict
+        return lambda: slotted(model, lazy=lazy).from_json({})
+    return None
+
+
+def slotted(model: Type[jsonobject.JsonObject], lazy: bool = False) -> type:
+    """
+    Return the `__slots__` class generated from a jsonobject model, building it on first use.
+
+    :param model: The jsonobject model to mirror
+    :param lazy: Whether nested objects, lists and dates are converted on first access instead of on load
+    :return: The generated class. Instances are built with `from_json`.
+    """
+    cls = _SLOTTED.get((model, lazy))
+    if cls is not None:
+        return cls
+    properties = model._properties_by_attr
+    fields = {
+        attr: (prop.name, _converter(prop, lazy), _default(prop, lazy), blank_as_none(prop))
+        for attr, prop in properties.items()
+    }
+    namespace = {
+        "__model__": model,
+        "__module__": __name__,
+        "_attr_by_key": {prop.name: attr for attr, prop in properties.items()},
+    }
+    if not lazy:
+        namespace["__slots__"] = tuple(fields)
+        cls = type(model.__name__, (SlottedModel,), namespace)
+        cls._fields = tuple(
+            (attr, key, convert, default, blank)
+            for attr, (key, convert, default, blank) in fields.items()
+        )
+        _SLOTTED[(model, lazy)] = cls
+        return cls
+
+    deferred = [
+        attr
+        for attr, (_, convert, default, _) in fields.items()
+        if convert is not None or default is not None
+    ]
+    namespace["__slots__"] = tuple(
+        f"_lazy_{attr}" if attr in deferred else attr for attr in fields
+    )
+    for attr in deferred:
+        _, convert, default, _ = fields[attr]
+        namespace[attr] = _LazyField(convert, default)
+    cls = type(model.__name__, (LazySlottedModel,), namespace)
+    for attr in deferred:
+        namespace[attr].slot = cls.__dict__[f"_lazy_{attr}"]
+    cls._lazy_fields = tuple((f"_lazy_{attr}", fields[attr][0]) for attr in deferred)
+    cls._fields = tuple(
+        (attr, key, None, None, blank)
+        for attr, (key, _, _, blank) in fields.items()
+        if attr not in deferred
+    )
+    _SLOTTED[(model, lazy)] = cls
+    return cls
+
+
+def model_of(obj: Any) -> type:
+    """
+    The jsonobject model an object was loaded as, regardless of model backend.
+    """
+    return getattr(type(obj), "__model__", None) or type(obj)
+
+
+def is_model(obj: Any, *models: type) -> bool:
+    """
+    Backend-independent `isinstance` check against jsonobject models.
+    """
+    return issubclass(model_of(obj), models)
@@ -1,9 +1,15 @@
+from typing import Literal, get_args
+
 import jsonobject
 
 
 from .notification import NotificationTypes
 
 
+UsersSortOpts = Literal["created", "updated", "requests", "displayname"]
+USERS_SORT_OPTS = get_args(UsersSortOpts)
+
+
 class User(jsonobject.JsonObject):
     id = jsonobject.IntegerProperty(name="id")
     email = jsonobject.StringProperty(name="email")
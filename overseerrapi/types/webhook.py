@@ -0,0 +1,65 @@
+from typing import Literal, Optional, get_args
+
+import jsonobject
+
+
+# Notification types sent by overseerr's webhook agent
+WebhookNotificationTypes = Literal[
+    "TEST_NOTIFICATION",
+    "MEDIA_PENDING",
+    "MEDIA_APPROVED",
+    "MEDIA_AUTO_APPROVED",
+    "MEDIA_AVAILABLE",
+    "MEDIA_DECLINED",
+    "MEDIA_FAILED",
+    "ISSUE_CREATED",
+    "ISSUE_COMMENT",
+    "ISSUE_RESOLVED",
+    "ISSUE_REOPENED",
+]
+WEBHOOK_NOTIFICATION_TYPES = get_args(WebhookNotificationTypes)
+
+
+def _int_or_none(value: Optional[str]) -> Optional[int]:
+    # The default template renders ids as strings, and as "" when not applicable
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class WebhookMedia(jsonobject.JsonObject):
+    media_type = jsonobject.StringProperty(name="media_type")
+    tmdb_id_raw = jsonobject.DefaultProperty(name="tmdbId")
+    tvdb_id_raw = jsonobject.DefaultProperty(name="tvdbId")
+    status = jsonobject.StringProperty(name="status")
+    status_4k = jsonobject.StringProperty(name="status4k")
+
+    @property
+    def tmdb_id(self) -> Optional[int]:
+        return _int_or_none(self.tmdb_id_raw)
+
+
+class WebhookRequest(jsonobject.JsonObject):
+    request_id_raw = jsonobject.DefaultProperty(name="request_id")
+    requested_by_email = jsonobject.StringProperty(name="requestedBy_email")
+    requested_by_username = jsonobject.StringProperty(name="requestedBy_username")
+    requested_by_avatar = jsonobject.StringProperty(name="requestedBy_avatar")
+
+    @property
+    def request_id(self) -> Optional[int]:
+        return _int_or_none(self.request_id_raw)
+
+
+class WebhookPayload(jsonobject.JsonObject):
+    """
+    Body of overseerr's default webhook JSON payload template.
+    """
+
+    notification_type = jsonobject.StringProperty(name="notification_type")
+    event = jsonobject.StringProperty(name="event")
+    subject = jsonobject.StringProperty(name="subject")
+    message = jsonobject.StringProperty(name="message")
+    image = jsonobject.StringProperty(name="image")
+    media = jsonobject.ObjectProperty(lambda: WebhookMedia, name="media")
+    request = jsonobject.ObjectProperty(lambda: WebhookRequest, name="request")
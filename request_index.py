@@ -0,0 +1,252 @@
+import bisect
+import itertools
+import logging
+import math
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from overseerrapi import OverseerrAPI
+from overseerrapi.types import (
+    MediaTypes,
+    PageInfo,
+    Request,
+    RequestsFilterByOpts,
+    RequestsSortOpts,
+)
+
+log = logging.getLogger(__name__)
+
+# Request statuses
+PENDING, APPROVED, DECLINED, FAILED = 1, 2, 3, 4
+# Media statuses
+UNKNOWN, MEDIA_PENDING, PROCESSING, PARTIALLY_AVAILABLE, AVAILABLE = 1, 2, 3, 4, 5
+
+# Mirrors overseerr's `GET /request` filters: (request statuses, media statuses), None matching any
+_FILTERS = {
+    "all": (None, None),
+    "approved": ({APPROVED}, None),
+    "available": ({APPROVED}, {AVAILABLE}),
+    "pending": ({PENDING}, None),
+    "processing": ({APPROVED}, {UNKNOWN, MEDIA_PENDING, PROCESSING, PARTIALLY_AVAILABLE}),
+    "unavailable": (
+        {PENDING, APPROVED},
+        {UNKNOWN, MEDIA_PENDING, PROCESSING, PARTIALLY_AVAILABLE},
+    ),
+    "failed": ({FAILED}, None),
+}
+
+# Sort keys, ascending in the order overseerr returns requests
+_SORT_KEYS: Dict[str, Callable[[Request], Tuple]] = {
+    "added": lambda r: (-r.id,),
+    "modified": lambda r: (-r.updated_at.timestamp(), -r.id),
+}
+
+
+class RequestPage:
+    """A page of indexed requests, read like the `Requests` returned by overseerr"""
+
+    __slots__ = ("page_info", "results")
+
+    def __init__(self, page_info: PageInfo, results: List[Request]) -> None:
+        self.page_info = page_info
+        self.results = results
+
+
+class RequestIndex:
+    """
+    Local copy of overseerr's requests, kept up to date by delta syncs and webhook notifications.
+
+    Requests are indexed by status, media status, media type and requester, and kept in both of overseerr's
+    sort orders, so `query` filters, sorts and pages without scanning every request.
+    `ready` is False until the first full load, reads should go to overseerr until then.
+    """
+
+    def __init__(self) -> None:
+        self._requests: Dict[int, Request] = {}
+        self._by_status: Dict[int, Set[int]] = {}
+        self._by_media_status: Dict[Optional[int], Set[int]] = {}
+        self._by_media_type: Dict[Optional[str], Set[int]] = {}
+        self._by_requester: Dict[int, Set[int]] = {}
+        # Per sort: sorted (key, id) pairs
+        self._orders: Dict[str, List[Tuple[Tuple, int]]] = {sort: [] for sort in _SORT_KEYS}
+        self.ready = False
+        self.loaded_at: Optional[datetime] = None
+        self.synced_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __contains__(self, request_id: int) -> bool:
+        return request_id in self._requests
+
+    def __iter__(self) -> Iterator[Request]:
+        return iter(list(self._requests.values()))
+
+    def get(self, request_id: int) -> Optional[Request]:
+        return self._requests.get(request_id)
+
+    @property
+    def updated_through(self) -> Optional[datetime]:
+        """The newest `updated_at` in the index; delta syncs fetch what changed since"""
+        order = self._orders["modified"]
+        return self._requests[order[0][1]].updated_at if order else None
+
+    def _buckets(self, request: Request) -> Iterable[Tuple[Dict[Hashable, Set[int]], Hashable]]:
+        media = request.media
+        yield self._by_status, request.status
+        yield self._by_media_status, media.status if media is not None else None
+        yield self._by_media_type, media.media_type if media is not None else None
+        yield self._by_requester, request.requested_by.id
+
+    def _add(self, request: Request) -> None:
+        self._requests[request.id] = request
+        for index, value in self._buckets(request):
+            index.setdefault(value, set()).add(request.id)
+        for sort, key in _SORT_KEYS.items():
+            bisect.insort(self._orders[sort], (key(request), request.id))
+
+    def _discard(self, request: Request) -> None:
+        del self._requests[request.id]
+        for index, value in self._buckets(request):
+            ids = index[value]
+            ids.discard(request.id)
+            if not ids:
+                del index[value]
+        for sort, key in _SORT_KEYS.items():
+            order = self._orders[sort]
+            del order[bisect.bisect_left(order, (key(request), request.id))]
+
+    def upsert(self, request: Request) -> bool:
+        """
+        Add or replace `request` unless the indexed copy is newer.
+
+        :return: Whether the index changed
+        """
+        current = self._requests.get(request.id)
+        if current is not None:
+            if current.updated_at > request.updated_at:
+                return False
+            self._discard(current)
+        self._add(request)
+        return True
+
+    def remove(self, request_id: int) -> bool:
+        current = self._requests.get(request_id)
+        if current is None:
+            return False
+        self._discard(current)
+        return True
+
+    def replace_all(self, requests: Iterable[Request]) -> None:
+        """
+        Replace the index with a full listing, keeping entries that were updated while it was fetched.
+        """
+        previous = self._requests
+        self._requests = {}
+        self._by_status.clear()
+        self._by_media_status.clear()
+        self._by_media_type.clear()
+        self._by_requester.clear()
+        for order in self._orders.values():
+            order.clear()
+        for request in requests:
+            self.upsert(request)
+        for request_id, request in previous.items():
+            loaded = self._requests.get(request_id)
+            if loaded is not None and loaded.updated_at < request.updated_at:
+                self.upsert(request)
+        self.ready = True
+        self.loaded_at = self.synced_at = datetime.now()
+        log.info("Indexed %d requests", len(self._requests))
+
+    def _union(self, index: Dict[Hashable, Set[int]], values: Optional[Iterable[Hashable]]) -> Optional[Set[int]]:
+        if values is None:
+            return None
+        return set().union(*(index.get(value, ()) for value in values))
+
+    def query(
+        self,
+        *,
+        take: int = 20,
+        skip: int = 0,
+        filter_by: RequestsFilterByOpts = "all",
+        sort: RequestsSortOpts = "added",
+        requested_by: Optional[int] = None,
+        media_type: Optional[MediaTypes] = None,
+    ) -> RequestPage:
+        """
+        Filter, sort and page the indexed requests the way overseerr's `GET /request` does.
+        Takes the same arguments as `OverseerrAPI.get_all_requests`.
+
+        :param media_type: Only return requests for `"movie"` or `"tv"`
+        :type media_type: Optional[str]
+        """
+        if take < 1:
+            raise RuntimeError(f"Invalid page size: `{take}`")
+        if filter_by not in _FILTERS:
+            raise RuntimeError(f"Invalid filter: `{filter_by}`")
+        if sort not in _SORT_KEYS:
+            raise RuntimeError(f"Invalid sort: `{sort}`")
+        statuses, media_statuses = _FILTERS[filter_by]
+        candidates = [
+            ids
+            for ids in (
+                self._union(self._by_status, statuses),
+                self._union(self._by_media_status, media_statuses),
+                None if media_type is None else self._by_media_type.get(media_type, set()),
+                None if requested_by is None else self._by_requester.get(requested_by, set()),
+            )
+            if ids is not None
+        ]
+        order = self._orders[sort]
+        if candidates:
+            matches = set.intersection(*sorted(candidates, key=len))
+            total = len(matches)
+            matching = (request_id for _, request_id in order if request_id in matches)
+            ids = list(itertools.islice(matching, skip, skip + take))
+        else:
+            total = len(order)
+            ids = [request_id for _, request_id in order[skip : skip + take]]
+        page_info = PageInfo(
+            pages=math.ceil(total / take),
+            page_size=take,
+            results=total,
+            page=math.ceil(skip / take) + 1,
+        )
+        return RequestPage(page_info, [self._requests[request_id] for request_id in ids])
+
+    async def get_all_requests(self, **params: Any) -> RequestPage:
+        """`query` with the signature of `OverseerrAPI.get_all_requests`, for views paging through requests"""
+        return self.query(**params)
+
+    async def load(self, client: OverseerrAPI, *, page_size: int = 100) -> None:
+        """Replace the index with every request in overseerr"""
+        requests = [
+            request
+            async for request in client.requests_iterator(page_size=page_size, filter_by="all")
+        ]
+        self.replace_all(requests)
+
+    async def sync(self, client: OverseerrAPI, *, page_size: int = 20) -> int:
+        """
+        Fetch the requests modified since the newest indexed one, most recently modified first,
+        stopping at the first older request. Requests deleted from overseerr are only dropped by `load`.
+
+        :return: The number of requests fetched
+        """
+        since = self.updated_through
+        fetched = 0
+        requests = client.requests_iterator(
+            page_size=page_size, lookahead=0, filter_by="all", sort="modified"
+        )
+        async with aclosing(requests):
+            async for request in requests:
+                if since is not None and request.updated_at < since:
+                    break
+                self.upsert(request)
+                fetched += 1
+        self.synced_at = datetime.now()
+        if fetched:
+            log.debug("Synced %d modified requests", fetched)
+        return fetched
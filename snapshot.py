@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "overseerr_maps.json"
+)
+
+
+def _int_keys(mapping: Dict[str, Any]) -> Dict[int, Any]:
+    return {int(k): v for k, v in mapping.items()}
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+    """Load the genre and discord id maps saved by `save_snapshot`.
+
+    Returns None if the file is missing, unreadable, malformed or from another snapshot version.
+    JSON object keys are converted back to ints.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        log.info("No map snapshot at %s", path)
+        return None
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable map snapshot %s: %s", path, e)
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        log.info("Ignoring map snapshot with version %s", data.get("version"))
+        return None
+    saved_at = data.get("saved_at")
+    if not saved_at:
+        log.warning("Ignoring map snapshot %s without a save time", path)
+        return None
+    try:
+        snapshot = {
+            "saved_at": datetime.fromisoformat(saved_at),
+            "genre_id_map": {
+                media_type: _int_keys(genres)
+                for media_type, genres in data.get("genre_id_map", {}).items()
+            },
+            "discord_id_map": {
+                int(k): v for k, v in data.get("discord_id_map", {}).items()
+            },
+            "user_discord_ids": _int_keys(data.get("user_discord_ids", {})),
+            "user_updated_at": {
+                int(k): datetime.fromisoformat(v) if v else None
+                for k, v in data.get("user_updated_at", {}).items()
+            },
+        }
+    except (AttributeError, TypeError, ValueError) as e:
+        log.warning("Ignoring malformed map snapshot %s: %s", path, e)
+        return None
+    log.info("Loaded map snapshot from %s (saved %s)", path, saved_at)
+    return snapshot
+
+
+def save_snapshot(
+    *,
+    genre_id_map: Dict[str, Dict[int, str]],
+    discord_id_map: Dict[int, int],
+    user_discord_ids: Dict[int, int],
+    user_updated_at: Dict[int, Optional[datetime]],
+    path: str = DEFAULT_SNAPSHOT_PATH,
+) -> None:
+    """Atomically write the maps to `path` so a restart can serve commands before they're refreshed."""
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": datetime.now().isoformat(),
+        "genre_id_map": genre_id_map,
+        "discord_id_map": discord_id_map,
+        "user_discord_ids": user_discord_ids,
+        "user_updated_at": {
+            k: v.isoformat() if v else None for k, v in user_updated_at.items()
+        },
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    log.debug("Saved map snapshot to %s", path)
@@ -0,0 +1,196 @@
+import bisect
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from overseerrapi.shared.text import normalize_query
+from overseerrapi.types import MovieDetails, TVDetails, is_model
+
+log = logging.getLogger(__name__)
+
+# (media type, tmdb id)
+TitleKey = Tuple[str, int]
+
+AVAILABLE = 5
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_title(value: str) -> str:
+    """Casefold, strip diacritics and punctuation, and collapse whitespace"""
+    return normalize_query(_NON_WORD.sub(" ", value))
+
+
+def _field(result: Any, key: str) -> Any:
+    # Item access by JSON key works for every model backend, including untyped search results
+    try:
+        return result[key]
+    except KeyError:
+        return None
+
+
+def _trigrams(value: str) -> Set[str]:
+    padded = f"  {value} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleEntry:
+    __slots__ = ("key", "title", "year", "available", "normalized", "trigrams")
+
+    def __init__(self, key: TitleKey, title: str, year: Optional[str], available: bool) -> None:
+        self.key = key
+        self.title = title
+        self.year = year
+        self.available = available
+        self.normalized = normalize_title(title)
+        self.trigrams = _trigrams(self.normalized)
+
+    @property
+    def label(self) -> str:
+        """How the title is shown in autocomplete suggestions, at most 100 characters"""
+        year = f" ({self.year})" if self.year else ""
+        available = " ✓" if self.available else ""
+        suffix = f"{year} · {self.key[0]}{available}"
+        return self.title[: 100 - len(suffix)] + suffix
+
+
+class TitleIndex:
+    """
+    Bounded in-memory index of movie and tv titles for autocomplete.
+
+    Titles are matched by prefix of the whole title, then by prefix of every query word, then by
+    trigram similarity to tolerate typos. The least recently added or refreshed titles are evicted
+    once `maxsize` is reached.
+
+    :param maxsize: Maximum number of titles kept
+    :param min_similarity: Share of the query's trigrams a title needs for a fuzzy match
+    """
+
+    def __init__(self, maxsize: int = 5000, min_similarity: float = 0.5) -> None:
+        self.maxsize = maxsize
+        self.min_similarity = min_similarity
+        self._entries: "OrderedDict[TitleKey, TitleEntry]" = OrderedDict()
+        # Sorted (word, key) pairs for every word of every title, and the full title as a word
+        self._words: List[Tuple[str, TitleKey]] = []
+        self._trigrams: Dict[str, Set[TitleKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: TitleKey) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def _words_of(entry: TitleEntry) -> Set[str]:
+        return {entry.normalized, *entry.normalized.split()}
+
+    def add(
+        self,
+        media_type: str,
+        tmdb_id: int,
+        title: Optional[str],
+        year: Optional[str] = None,
+        available: bool = False,
+    ) -> None:
+        if not title or media_type not in ("movie", "tv"):
+            return
+        key = (media_type, tmdb_id)
+        current = self._entries.get(key)
+        if current is not None:
+            if current.title == title:
+                current.year = year or current.year
+                current.available = available
+                self._entries.move_to_end(key)
+                return
+            self._remove(current)
+        entry = TitleEntry(key, title, year, available)
+        self._entries[key] = entry
+        for word in self._words_of(entry):
+            bisect.insort(self._words, (word, key))
+        for trigram in entry.trigrams:
+            self._trigrams.setdefault(trigram, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries.values())))
+
+    def _remove(self, entry: TitleEntry) -> None:
+        del self._entries[entry.key]
+        for word in self._words_of(entry):
+            i = bisect.bisect_left(self._words, (word, entry.key))
+            del self._words[i]
+        for trigram in entry.trigrams:
+            keys = self._trigrams[trigram]
+            keys.discard(entry.key)
+            if not keys:
+                del self._trigrams[trigram]
+
+    def add_result(self, result: Any) -> None:
+        """Index a search result or movie/tv details; other results, e.g. people, are ignored"""
+        if is_model(result, MovieDetails):
+            media_type = "movie"
+        elif is_model(result, TVDetails):
+            media_type = "tv"
+        else:
+            media_type = _field(result, "mediaType")
+        if media_type == "movie":
+            title, date = _field(result, "title"), _field(result, "releaseDate")
+        elif media_type == "tv":
+            title, date = _field(result, "name"), _field(result, "firstAirDate")
+        else:
+            return
+        media_info = _field(result, "mediaInfo")
+        self.add(
+            media_type,
+            result["id"],
+            title,
+            year=str(date)[:4] if date else None,
+            available=bool(media_info) and media_info["status"] == AVAILABLE,
+        )
+
+    def add_results(self, results: Iterable[Any]) -> None:
+        for result in results:
+            self.add_result(result)
+
+    def _prefixed(self, prefix: str) -> Iterable[TitleKey]:
+        i = bisect.bisect_left(self._words, (prefix,))
+        while i < len(self._words) and self._words[i][0].startswith(prefix):
+            yield self._words[i][1]
+            i += 1
+
+    def complete(self, query: str, limit: int = 25) -> List[TitleEntry]:
+        """
+        Titles matching what has been typed so far, best matches first.
+
+        :param query: The partial title
+        :param limit: Maximum number of titles returned
+        """
+        normalized = normalize_title(query)
+        if not normalized:
+            return []
+        found: Dict[TitleKey, None] = {}
+        # Whole title prefix
+        for key in self._prefixed(normalized):
+            if self._entries[key].normalized.startswith(normalized):
+                found[key] = None
+        # Every query word is a prefix of a title word, e.g. "knight dark" finds "The Dark Knight"
+        words = normalized.split()
+        if len(found) < limit:
+            candidates = set(self._prefixed(words[0]))
+            for word in words[1:]:
+                candidates &= set(self._prefixed(word))
+            for key in sorted(candidates, key=lambda k: len(self._entries[k].normalized)):
+                found.setdefault(key)
+        # Shared trigrams, for typos
+        if len(found) < limit and len(normalized) >= 3:
+            query_trigrams = _trigrams(normalized)
+            shared: Dict[TitleKey, int] = {}
+            for trigram in query_trigrams:
+                for key in self._trigrams.get(trigram, ()):
+                    shared[key] = shared.get(key, 0) + 1
+            needed = self.min_similarity * len(query_trigrams)
+            for key in sorted(
+                (k for k, count in shared.items() if count >= needed),
+                key=lambda k: -shared[k],
+            ):
+                found.setdefault(key)
+        return [self._entries[key] for key in list(found)[:limit]]
@@ -1,7 +1,12 @@
 from discord.ui.item import Item
 import discord
-from typing import Self, Dict, TypedDict, Union, Any
-from overseerrapi import OverseerrAPI
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Self, Dict, TypedDict, Union, Any, Awaitable, Callable, Hashable, List, Optional, Tuple
+from overseerrapi import BulkItemResult, OverseerrAPI, Priority
+from overseerrapi.shared.metrics import REGISTRY
+from overseerrapi.shared.logs import TRACE, log_payload
 from overseerrapi.types import (
     MediaSearchResult,
     Genres,
@@ -14,18 +19,90 @@ from overseerrapi.types import (
     MediaInfo,
     TVDetails,
     MovieDetails,
+    ErrorResponse,
+    is_model,
 )
+from request_index import RequestIndex
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+PAGINATE_DURATION = REGISTRY.histogram(
+    "bot_paginate_duration_seconds",
+    "Time from a button click to the full embed being shown",
+    ["view"],
+)
+EMBED_RENDER_DURATION = REGISTRY.histogram(
+    "bot_embed_render_seconds",
+    "Time spent building an embed from a loaded result",
+    ["view"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+
+
+EMBED_CACHE_LOOKUPS = REGISTRY.counter(
+    "bot_embed_cache_lookups_total",
+    "Media embeds served from the render cache (hit) or rendered from scratch (miss)",
+    ["result"],
+)
+
+
+def _failed(action: str, resp: ErrorResponse) -> str:
+    """Message telling the user overseerr rejected `action`"""
+    reason = resp.message or (f"HTTP {resp.status}" if resp.status else "unknown error")
+    return f"{action} failed: {reason}"
+
 
 class GenreIDMap(TypedDict):
     movie: Genres
     tv: Genres
 
 
+# (media type, tmdb id, media status, genre map version, rendered from details or a list result)
+EmbedKey = Tuple[str, int, Optional[int], int, bool]
+
+
+class EmbedCache:
+    """
+    Bounded cache of rendered media embeds, without the footer, so paging back to a result only sets the
+    footer again. Shared by every view; the least recently used embeds are evicted once `maxsize` is reached.
+
+    :param maxsize: Maximum number of embeds kept
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        # Part of the key, so genre names fetched later aren't hidden by embeds rendered without them
+        self.genre_version = 0
+        self._embeds: "OrderedDict[EmbedKey, discord.Embed]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._embeds)
+
+    def get(self, key: EmbedKey) -> Optional[discord.Embed]:
+        embed = self._embeds.get(key)
+        if embed is None:
+            EMBED_CACHE_LOOKUPS.inc(result="miss")
+            return None
+        EMBED_CACHE_LOOKUPS.inc(result="hit")
+        self._embeds.move_to_end(key)
+        return embed.copy()
+
+    def set(self, key: EmbedKey, embed: discord.Embed) -> None:
+        if self.maxsize <= 0:
+            return
+        self._embeds[key] = embed.copy()
+        self._embeds.move_to_end(key)
+        while len(self._embeds) > self.maxsize:
+            self._embeds.popitem(last=False)
+
+    def genre_map_changed(self) -> None:
+        """Stop serving embeds rendered with the previous genre names"""
+        self.genre_version += 1
+        self._embeds.clear()
+
+
 class OverseerrView(discord.ui.View):
     def __init__(
         self,
@@ -36,6 +113,9 @@ class OverseerrView(discord.ui.View):
         *items: Item,
         timeout: float | None = 180,
         disable_on_timeout: bool = False,
+        prefetch_depth: int = 2,
+        progressive: bool = True,
+        embed_cache: Optional[EmbedCache] = None,
     ) -> Self:
         super().__init__(*items, timeout=timeout, disable_on_timeout=disable_on_timeout)
         self.cmd_by_user_id: int = user_id
@@ -44,11 +124,131 @@ class OverseerrView(discord.ui.View):
         self._index: int = 0
         self._genre_id_map = genre_id_map
         self._discord_id_map = discord_id_map
+        self._prefetch_depth = prefetch_depth
+        self._progressive = progressive
+        self._prefetch_tasks: Dict[Hashable, asyncio.Task] = {}
+        self._embed_cache = embed_cache if embed_cache is not None else EmbedCache()
         self.interaction_check = self.check_interaction
 
+    def _prefetch(
+        self, wanted: Dict[Hashable, Callable[[], Awaitable[Any]]]
+    ) -> None:
+        """
+        Start background fetches for `wanted` and cancel the ones that are no longer wanted.
+        """
+        for key in list(self._prefetch_tasks):
+            if key not in wanted:
+                self._prefetch_tasks.pop(key).cancel()
+        # Speculative, so queued behind calls for what the user is looking at right now
+        with self.overseerr_client.priority(Priority.PREFETCH):
+            for key, fetch in wanted.items():
+                if key not in self._prefetch_tasks:
+                    logger.debug("Prefetching %s", key)
+                    self._prefetch_tasks[key] = asyncio.create_task(fetch())
+
+    async def _prefetched(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Result of a prefetch for `key` if one finished, otherwise fetch it now.
+        """
+        prefetch = self._prefetch_tasks.get(key)
+        if prefetch is not None and prefetch.done() and not prefetch.cancelled():
+            try:
+                return prefetch.result()
+            except Exception as e:
+                logger.debug("Prefetch for %s failed, fetching again: %s", key, e)
+        # A prefetch still in flight is queued behind calls for what users are looking at. Fetching at this
+        # caller's priority joins its call, which the client re-issues at the higher priority.
+        # Kept as a task so the next prefetch window doesn't fetch it again
+        task = self._prefetch_tasks[key] = asyncio.create_task(fetch())
+        if prefetch is not None and not prefetch.done():
+            # Cancelled once replaced rather than right away, which would drop the call the fetch joins. It
+            # shares the fetch's result, or is cancelled along with it by `_cancel_prefetch`.
+            task.add_done_callback(lambda _: prefetch.cancel())
+        return await asyncio.shield(task)
+
+    def _prefetch_done(self, key: Hashable) -> bool:
+        task = self._prefetch_tasks.get(key)
+        return (
+            task is not None
+            and task.done()
+            and not task.cancelled()
+            and task.exception() is None
+        )
+
+    async def _paginate(self, interaction: discord.Interaction) -> None:
+        """
+        Render the current result. In progressive mode, if that needs a round trip to overseerr,
+        acknowledge the interaction right away with a skeleton embed and patch in the full embed once loaded.
+        """
+        with PAGINATE_DURATION.time(view=type(self).__name__):
+            await self._render_page(interaction)
+
+    async def _render_page(self, interaction: discord.Interaction) -> None:
+        if self._progressive and not self._render_ready():
+            self._skeleton_embed()
+            # Navigation stays disabled until the full embed replaces the skeleton
+            self.children[0].disabled = True
+            self.children[1].disabled = True
+            await interaction.response.edit_message(embed=self.embed, view=self)
+            try:
+                await self._load_page()
+                await self._edit_embed()
+            except Exception:
+                # The interaction is already acknowledged, so replace the skeleton rather than leave it stuck
+                logger.exception("Failed to load result %d", self.result_number)
+                self._error_embed()
+            finally:
+                if not self.is_finished():
+                    self.children[0].disabled = self.previous_button_disabled
+                    self.children[1].disabled = self.next_button_disabled
+                await interaction.edit_original_response(embed=self.embed, view=self)
+            return
+        await self._load_page()
+        await self._edit_embed()
+        await interaction.response.edit_message(embed=self.embed, view=self)
+
+    def _render_ready(self) -> bool:
+        """Whether everything needed to render the current result is already in hand"""
+        return True
+
+    async def _load_page(self) -> None:
+        """Switch to the neighbouring results page if the index moved off the current one"""
+
+    def _skeleton_embed(self) -> None:
+        self.clear_embed()
+        self.embed.title = "Loading..."
+        self.embed.set_footer(
+            text=f"Result {self.result_number} out of {self.result_count}"
+        )
+
+    def _error_embed(self) -> None:
+        self._embed = discord.Embed(color=discord.Color.red())
+        self.embed.title = "Couldn't load this result"
+        self.embed.description = "Overseerr didn't answer in time or returned an error, please try again."
+        self.embed.set_footer(
+            text=f"Result {self.result_number} out of {self.result_count}"
+        )
+
+    def _cancel_prefetch(self) -> None:
+        for task in self._prefetch_tasks.values():
+            task.cancel()
+        self._prefetch_tasks.clear()
+
+    def stop(self) -> None:
+        self._cancel_prefetch()
+        super().stop()
+
+    async def on_timeout(self) -> None:
+        self._cancel_prefetch()
+        await super().on_timeout()
+
+    @property
     def previous_button_disabled(self) -> bool:
         return self.result_number <= 1
 
+    @property
     def next_button_disabled(self) -> bool:
         return self.result_count == self.result_number
 
@@ -58,12 +258,14 @@ class OverseerrView(discord.ui.View):
     def _movie_embed(self, result: Union[MovieResult, MovieDetails]) -> None:
         self._embed = discord.Embed(color=discord.Color.blurple())
         self.embed.title = result.title
-        self.embed.add_field(name="Released", value=result.release_date, inline=True)
+        if result.release_date:
+            self.embed.add_field(name="Released", value=result.release_date, inline=True)
 
     def _tv_embed(self, result: Union[TVDetails, TvResult]) -> None:
         self._embed = discord.Embed(color=discord.Color.blurple())
         self.embed.title = result.name
-        self.embed.add_field(name="Released", value=result.first_air_date, inline=True)
+        if result.first_air_date:
+            self.embed.add_field(name="Released", value=result.first_air_date, inline=True)
 
     def _person_embed(self, result: PersonResult) -> None:
         self.embed.title = result.name
@@ -73,32 +275,66 @@ class OverseerrView(discord.ui.View):
     def media_common_embed(
         self, result: Union[MovieResult, MovieDetails, TVDetails, TvResult]
     ) -> discord.Embed:
+        start = time.perf_counter()
+        try:
+            self._media_common_embed(result)
+        finally:
+            EMBED_RENDER_DURATION.observe(
+                time.perf_counter() - start, view=type(self).__name__
+            )
+
+    def _embed_key(self, result: Any) -> EmbedKey:
+        if is_model(result, PersonResult):
+            return ("person", result.id, None, self._embed_cache.genre_version, False)
+        media_type = "movie" if is_model(result, MovieResult, MovieDetails) else "tv"
+        status = result.media_info.status if result.media_info else None
+        details = is_model(result, MovieDetails, TVDetails)
+        return (media_type, result.id, status, self._embed_cache.genre_version, details)
+
+    def _media_common_embed(
+        self, result: Union[MovieResult, MovieDetails, TVDetails, TvResult]
+    ) -> None:
+        key = self._embed_key(result)
+        embed = self._embed_cache.get(key)
+        if embed is None:
+            self._render_media(result)
+            self._embed_cache.set(key, self.embed)
+        else:
+            self._embed = embed
+        if is_model(result, PersonResult):
+            return
+        self.embed.set_footer(
+            text=f"Result {self.result_number} out of {self.result_count}\n\n{self.embed.title} | ID: {result.id}"
+        )
+        if self._is_stale(result):
+            self._mark_stale()
+
+    def _render_media(
+        self, result: Union[MovieResult, MovieDetails, TVDetails, TvResult]
+    ) -> None:
+        """Build the embed for `result`, except for the footer"""
         self.clear_embed()
-        if isinstance(result, PersonResult):
+        if is_model(result, PersonResult):
             self._person_embed(result)
             return
 
-        if isinstance(result, (TvResult, MovieResult)) and (x := result.genre_ids):
+        if is_model(result, TvResult, MovieResult) and (x := result.genre_ids):
             genre_str = ", ".join(
                 self.genre_id_map[result.media_type].get(i, "")
                 for i in x
                 if i in self.genre_id_map[result.media_type]
             )
-        elif isinstance(result, (MovieDetails, TVDetails)) and (x := result.genres):
+        elif is_model(result, MovieDetails, TVDetails) and (x := result.genres):
             genre_str = ", ".join(genre.name for genre in x)
         else:
             genre_str = None
-        if result.backdrop_path:
-            self.embed.set_image(url=self.backdrop_base + result.backdrop_path)
-        if result.poster_path:
-            self.embed.set_thumbnail(url=self.poster_base + result.poster_path)
 
-        if isinstance(result, (MovieResult, MovieDetails)):
+        if is_model(result, MovieResult, MovieDetails):
             self._movie_embed(result)
-        elif isinstance(result, (TvResult, TVDetails)):
+        elif is_model(result, TvResult, TVDetails):
             self._tv_embed(result)
         logger.debug("Setting up embed for %s", self.embed.title)
-        logger.trace("Data to parse: %s", result)
+        log_payload(logger, TRACE, "Data to parse: %s", result)
 
         self.embed.description = result.overview
         if result.backdrop_path:
@@ -128,8 +364,14 @@ class OverseerrView(discord.ui.View):
                 name="Vote Count", value=result.vote_count, inline=True
             )
 
+    def _is_stale(self, result: Any) -> bool:
+        """Whether `result` is cached data served because overseerr couldn't be reached"""
+        return self.overseerr_client.is_stale(result)
+
+    def _mark_stale(self) -> None:
+        self.embed.colour = discord.Color.orange()
         self.embed.set_footer(
-            text=f"Result {self.result_number} out of {self.result_count}\n\n{self.embed.title} | ID: {result.id}"
+            text=f"{self.embed.footer.text}\n⚠ Overseerr is unreachable, showing cached data"
         )
 
     async def check_interaction(self, interaction: discord.Interaction) -> bool:
@@ -180,6 +422,9 @@ class SearchView(OverseerrView):
         *items: Item,
         timeout: float | None = 180,
         disable_on_timeout: bool = False,
+        prefetch_depth: int = 2,
+        progressive: bool = True,
+        embed_cache: Optional[EmbedCache] = None,
     ) -> Self:
         super().__init__(
             overseerr_client,
@@ -189,6 +434,9 @@ class SearchView(OverseerrView):
             *items,
             timeout=timeout,
             disable_on_timeout=disable_on_timeout,
+            prefetch_depth=prefetch_depth,
+            progressive=progressive,
+            embed_cache=embed_cache,
         )
         self._index: int = 0
         self._query: str = search_query
@@ -208,22 +456,60 @@ class SearchView(OverseerrView):
     ) -> None:
         self._index += 1
         button.disabled = self.next_button_disabled
-        if self._needs_next_page:
-            self._results = await self._get_page(self._results.page + 1)
         await self._paginate(interaction)
 
+    async def _load_page(self) -> None:
+        if self._needs_previous_page:
+            self._results = await self._get_page(self._results.page - 1)
+            self._index = len(self._results.results) - 1
+        elif self._needs_next_page:
+            self._results = await self._get_page(self._results.page + 1)
+
+    def _render_ready(self) -> bool:
+        if self._needs_previous_page:
+            return self._prefetch_done(("page", self._results.page - 1))
+        if self._needs_next_page:
+            return self._prefetch_done(("page", self._results.page + 1))
+        return True
+
+    def _skeleton_embed(self) -> None:
+        super()._skeleton_embed()
+        self.embed.description = f"Fetching more results for {self._query}"
+
     @property
     def _needs_next_page(self) -> bool:
-        return self._index == 20 and self._results.page > self._results.total_pages
+        return (
+            self._index >= len(self._results.results)
+            and self._results.page < self._results.total_pages
+        )
 
     @property
     def _needs_previous_page(self) -> bool:
-        return self._index == 0 and 1 < self._results.page < self._results.total_pages
+        return self._index < 0 and self._results.page > 1
 
     async def _get_page(self, page: int) -> MediaSearchResult:
+        res = await self._prefetched(("page", page), self._page_fetcher(page))
         self._index = 0
-        res = await self.overseerr_client.search(self._query, page=page)
-        logger.trace("Returing page data: {}", res)
+        log_payload(logger, TRACE, "Returning page data: %s", res)
+        return res
+
+    def _page_fetcher(self, page: int) -> Callable[[], Awaitable[MediaSearchResult]]:
+        return lambda: self.overseerr_client.search(self._query, page=page)
+
+    def _schedule_prefetch(self) -> None:
+        """
+        Fetch the neighbouring search page in the background once the user is within `prefetch_depth` results of it.
+        """
+        wanted = {}
+        page = self._results.page
+        if (
+            len(self._results.results) - self._index <= self._prefetch_depth
+            and page < self._results.total_pages
+        ):
+            wanted[("page", page + 1)] = self._page_fetcher(page + 1)
+        if self._index < self._prefetch_depth and page > 1:
+            wanted[("page", page - 1)] = self._page_fetcher(page - 1)
+        self._prefetch(wanted)
 
     @property
     def previous_button_disabled(self) -> bool:
@@ -233,7 +519,7 @@ class SearchView(OverseerrView):
     def next_button_disabled(self) -> bool:
         return (
             self._results.total_pages == self._results.page
-            and self._index * self._results.page >= self.result_count - 1
+            and self._index >= len(self._results.results) - 1
         )
 
     @property
@@ -280,10 +566,16 @@ class SearchView(OverseerrView):
         #         content="You are not registered with Overseerr."
         #     )
         #     return
-        await self.overseerr_client.post_request(
+        resp = await self.overseerr_client.post_request(
             media_id=self.result.id,
             media_type=self.result.media_type,
         )
+        if isinstance(resp, ErrorResponse):
+            logger.warning("Request for %s failed: %s", self.embed.title, resp.message)
+            await interaction.edit_original_response(
+                content=_failed(f"Request for {self.embed.title}", resp)
+            )
+            return
         await interaction.edit_original_response(
             content=f"Request for {self.embed.title} sent! 🎉"
         )
@@ -296,10 +588,6 @@ class SearchView(OverseerrView):
         self.stop()
         await interaction.response.edit_message(view=self)
 
-    async def _paginate(self, interaction: discord.Interaction) -> None:
-        await self._edit_embed()
-        await interaction.response.edit_message(embed=self.embed, view=self)
-
     async def _update_buttons(self) -> None:
         """
         Done for embed time check
@@ -312,7 +600,7 @@ class SearchView(OverseerrView):
         if self.result.media_type == "person":
             self.children[2].disabled = True
             return
-        if isinstance(self.result, (MovieResult)):
+        if is_model(self.result, MovieResult):
             name = self.result.title
         else:
             name = self.result.name
@@ -321,7 +609,7 @@ class SearchView(OverseerrView):
             self.children[2].label = "Request"
             self.children[2].disabled = False
             return
-        logger.trace("Media status for %s: %d", name, status)
+        logger.log(TRACE, "Media status for %s: %d", name, status)
         status_map = {
             1: "Request",
             2: "Pending",
@@ -345,11 +633,16 @@ class SearchView(OverseerrView):
 
         await self._update_buttons()
         self.media_common_embed(self.result)
+        self._schedule_prefetch()
 
     @property
     def result_number(self):
         return (self._index + 1) + (self._results.page - 1) * 20
 
+    def _is_stale(self, result: Any) -> bool:
+        # Search results are cached by the page
+        return self.overseerr_client.is_stale(self._results)
+
 
 class RequestsView(OverseerrView):
     def __init__(
@@ -363,6 +656,11 @@ class RequestsView(OverseerrView):
         *items: Item,
         timeout: float | None = 180,
         disable_on_timeout: bool = False,
+        prefetch_depth: int = 2,
+        progressive: bool = True,
+        fetch_page: Optional[Callable[..., Awaitable[Requests]]] = None,
+        request_index: Optional[RequestIndex] = None,
+        embed_cache: Optional[EmbedCache] = None,
     ) -> Self:
         super().__init__(
             overseerr_client=overseerr_client,
@@ -372,8 +670,14 @@ class RequestsView(OverseerrView):
             *items,
             timeout=timeout,
             disable_on_timeout=disable_on_timeout,
+            prefetch_depth=prefetch_depth,
+            progressive=progressive,
+            embed_cache=embed_cache,
         )
         self._index: int = 0
+        # Where pages come from: overseerr, or the local request index
+        self._fetch_page = fetch_page or overseerr_client.get_all_requests
+        self._request_index = request_index
         self._requests: Requests = requests
         self._requests_length: int = (
             requests.page_info.pages * requests.page_info.page_size
@@ -386,9 +690,6 @@ class RequestsView(OverseerrView):
     ) -> None:
         self._index -= 1
         button.disabled = self.result_number <= 1
-        if self._index < 0 and self.page_info.page > self.page_info.pages:
-            self._requests = await self.get_results_page(-1)
-            self._index = 0
         await self._paginate(interaction)
 
     @discord.ui.button(style=discord.ButtonStyle.primary, label=">")
@@ -397,17 +698,93 @@ class RequestsView(OverseerrView):
     ) -> None:
         self._index += 1
         button.disabled = self.disable_next_button()
-        if self.result_number > self.page_info.results:
+        await self._paginate(interaction)
+
+    @property
+    def _needs_next_page(self) -> bool:
+        return (
+            self._index >= len(self._requests.results)
+            and self.page_info.page < self.page_info.pages
+        )
+
+    @property
+    def _needs_previous_page(self) -> bool:
+        return self._index < 0 and self.page_info.page > 1
+
+    async def _load_page(self) -> None:
+        if self._needs_previous_page:
+            self._requests = await self.get_results_page(-1)
+            self._index = len(self._requests.results) - 1
+        elif self._needs_next_page:
             self._requests = await self.get_results_page(1)
             self._index = 0
-        await self._paginate(interaction)
+
+    def _render_ready(self) -> bool:
+        if self._needs_previous_page or self._needs_next_page:
+            return False
+        media = self.request.media
+        return self._prefetch_done((media.media_type, media.tmdb_id))
+
+    def _skeleton_embed(self) -> None:
+        super()._skeleton_embed()
+        if self._needs_previous_page or self._needs_next_page:
+            self.embed.description = "Fetching more requests..."
+            return
+        request = self.request
+        requester = request.requested_by
+        self.embed.title = f"Request #{request.id}"
+        self.embed.description = "Fetching details..."
+        self.embed.add_field(name="Type", value=request.media.media_type, inline=True)
+        self.embed.add_field(name="TMDB ID", value=request.media.tmdb_id, inline=True)
+        self.embed.add_field(
+            name="Requested By",
+            value=requester.username or requester.plex_username or requester.email,
+            inline=True,
+        )
 
     def disable_next_button(self) -> bool:
         return self.result_number == self.page_info.results
 
-    async def get_results_page(self, page: int) -> MediaSearchResult:
-        self._params["skip"] = self.page_info.page * (self._params["take"] + page)
-        return await self.overseerr_client.get_all_requests(**self._params)
+    async def get_results_page(self, page: int) -> Requests:
+        """Fetch the page `page` pages away from the current one"""
+        number = self.page_info.page + page
+        self._params = self._page_params(number)
+        return await self._prefetched(("page", number), self._page_fetcher(number))
+
+    def _page_params(self, number: int) -> Dict[str, Any]:
+        return {**self._params, "skip": (number - 1) * self._params["take"]}
+
+    def _page_fetcher(self, number: int) -> Callable[[], Awaitable[Requests]]:
+        params = self._page_params(number)
+        return lambda: self._fetch_page(**params)
+
+    def _detail_fetcher(
+        self, media: MediaInfo
+    ) -> Callable[[], Awaitable[Union[TVDetails, MovieDetails]]]:
+        if media.media_type == "movie":
+            return lambda: self.overseerr_client.get_movie(media.tmdb_id)
+        return lambda: self.overseerr_client.get_tv(media.tmdb_id)
+
+    def _schedule_prefetch(self) -> None:
+        """
+        Fetch details of the `prefetch_depth` requests on either side of the current one in the background,
+        and the neighbouring page once the user is close to it.
+        """
+        wanted = {}
+        results = self._requests.results
+        for i in range(
+            max(self._index - self._prefetch_depth, 0),
+            min(self._index + self._prefetch_depth + 1, len(results)),
+        ):
+            media = results[i].media
+            if media.media_type in ("movie", "tv"):
+                wanted[(media.media_type, media.tmdb_id)] = self._detail_fetcher(media)
+        page = self.page_info.page
+        if len(results) - self._index <= self._prefetch_depth and page < self.page_info.pages:
+            wanted[("page", page + 1)] = self._page_fetcher(page + 1)
+        if self._index < self._prefetch_depth and page > 1:
+            wanted[("page", page - 1)] = self._page_fetcher(page - 1)
+        self._prefetch(wanted)
 
     @discord.ui.button(style=discord.ButtonStyle.success, label="Approve")
     async def approve(
@@ -420,10 +797,17 @@ class RequestsView(OverseerrView):
             view=self, embed=self.embed, content="Approving..."
         )
         resp = await self.overseerr_client.approve_request(self.request.id)
+        if isinstance(resp, ErrorResponse):
+            logger.warning("Approving request %s failed: %s", self.request.id, resp.message)
+            await interaction.edit_original_response(
+                content=_failed(f"Approving the request for {self.embed.title}", resp)
+            )
+            return
+        self._index_request(resp)
         logger.debug(
-            "Sent approval request for {}, (ID: {})", self.embed.title, self.request.id
+            "Sent approval request for %s, (ID: %s)", self.embed.title, self.request.id
         )
-        logger.trace("Response body: %s", resp)
+        log_payload(logger, TRACE, "Response body: %s", resp)
 
         await interaction.edit_original_response(
             content=f"Request for {self.embed.title} Approved! 🎉"
@@ -438,14 +822,22 @@ class RequestsView(OverseerrView):
         await interaction.response.edit_message(
             view=self, embed=self.embed, content="Denying..."
         )
-        await self.overseerr_client.deny_request(self.request.id)
+        resp = await self.overseerr_client.deny_request(self.request.id)
+        if isinstance(resp, ErrorResponse):
+            logger.warning("Denying request %s failed: %s", self.request.id, resp.message)
+            await interaction.edit_original_response(
+                content=_failed(f"Denying the request for {self.embed.title}", resp)
+            )
+            return
+        self._index_request(resp)
         await interaction.edit_original_response(
             content=f"Request for {self.embed.title} denied"
         )
 
-    async def _paginate(self, interaction: discord.Interaction) -> None:
-        await self._edit_embed()
-        await interaction.response.edit_message(embed=self.embed, view=self)
+    def _index_request(self, resp: Request) -> None:
+        """Show the new status in `/requests` without waiting for the next sync"""
+        if self._request_index is not None:
+            self._request_index.upsert(resp)
 
     async def _update_buttons(self) -> None:
         """
@@ -469,14 +861,15 @@ class RequestsView(OverseerrView):
             self.request.media
         )
         self.media_common_embed(result)
+        self._schedule_prefetch()
 
     async def get_request_info(
         self, media: MediaInfo
     ) -> Union[TVDetails, MovieDetails]:
-        if media.media_type == "movie":
-            return await self.overseerr_client.get_movie(media.tmdb_id)
-        elif media.media_type == "tv":
-            return await self.overseerr_client.get_tv(media.tmdb_id)
+        if media.media_type in ("movie", "tv"):
+            return await self._prefetched(
+                (media.media_type, media.tmdb_id), self._detail_fetcher(media)
+            )
 
     @property
     def page_info(self) -> PageInfo:
@@ -485,7 +878,7 @@ class RequestsView(OverseerrView):
     @property
     def result_number(self) -> int:
         """Returns index adjusted for pagination. Index starts at 1"""
-        return (self._index + 1) + (self.page_info.page - 1) * 20
+        return (self._index + 1) + (self.page_info.page - 1) * self.page_info.page_size
 
     @property
     def result_count(self) -> int:
@@ -494,3 +887,81 @@ class RequestsView(OverseerrView):
     @property
     def request(self) -> Request:
         return self._requests.results[self._index]
+
+
+class ConfirmView(discord.ui.View):
+    """Asks the user who ran a command to confirm it; `confirmed` is set once `wait()` returns"""
+
+    def __init__(self, user_id: int, *, timeout: float | None = 60) -> None:
+        super().__init__(timeout=timeout, disable_on_timeout=True)
+        self.cmd_by_user_id = user_id
+        self.confirmed = False
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.cmd_by_user_id
+
+    @discord.ui.button(style=discord.ButtonStyle.success, label="Confirm")
+    async def confirm(
+        self, button: discord.ui.Button, interaction: discord.Interaction
+    ) -> None:
+        self.confirmed = True
+        self.disable_all_items()
+        await interaction.response.edit_message(view=self)
+        self.stop()
+
+    @discord.ui.button(style=discord.ButtonStyle.secondary, label="Cancel")
+    async def cancel(
+        self, button: discord.ui.Button, interaction: discord.Interaction
+    ) -> None:
+        self.disable_all_items()
+        await interaction.response.edit_message(view=self)
+        self.stop()
+
+
+class BulkProgress:
+    """Counts the outcomes of a bulk approve/decline and renders them as an embed"""
+
+    BAR_WIDTH = 20
+    MAX_FAILURES_SHOWN = 10
+
+    def __init__(self, action: str, total: int) -> None:
+        self.action = action
+        self.total = total
+        self.succeeded = 0
+        self.failures: List[BulkItemResult] = []
+
+    @property
+    def done(self) -> int:
+        return self.succeeded + len(self.failures)
+
+    def add(self, item: BulkItemResult) -> None:
+        if item.ok:
+            self.succeeded += 1
+        else:
+            self.failures.append(item)
+
+    def embed(self, finished: bool = False) -> discord.Embed:
+        verb = "Approv" if self.action == "approve" else "Declin"
+        filled = self.BAR_WIDTH * self.done // max(self.total, 1)
+        if not finished:
+            colour = discord.Color.blurple()
+        elif self.failures:
+            colour = discord.Color.orange()
+        else:
+            colour = discord.Color.green()
+        embed = discord.Embed(
+            title=f"{verb}{'ed' if finished else 'ing'} {self.total} requests",
+            description=f"`{'█' * filled}{'░' * (self.BAR_WIDTH - filled)}` {self.done}/{self.total}",
+            colour=colour,
+        )
+        embed.add_field(name="Succeeded", value=str(self.succeeded), inline=True)
+        embed.add_field(name="Failed", value=str(len(self.failures)), inline=True)
+        if self.failures:
+            lines = [
+                f"#{item.id}: {item.error}"[:100]
+                for item in self.failures[: self.MAX_FAILURES_SHOWN]
+            ]
+            if len(self.failures) > self.MAX_FAILURES_SHOWN:
+                lines.append(f"...and {len(self.failures) - self.MAX_FAILURES_SHOWN} more")
+            embed.add_field(name="Failures", value="\n".join(lines), inline=False)
+        return embed
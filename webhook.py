@@ -0,0 +1,117 @@
+import asyncio
+import hmac
+import logging
+from typing import Awaitable, Callable, Optional, Set
+
+import discord
+from aiohttp import web
+from jsonobject.exceptions import BadValueError
+
+from overseerrapi.types import WebhookPayload
+
+log = logging.getLogger(__name__)
+
+WebhookHandler = Callable[[WebhookPayload], Awaitable[None]]
+
+NOTIFICATION_COLOURS = {
+    "MEDIA_PENDING": discord.Colour.blurple(),
+    "MEDIA_APPROVED": discord.Colour.green(),
+    "MEDIA_AUTO_APPROVED": discord.Colour.green(),
+    "MEDIA_AVAILABLE": discord.Colour.brand_green(),
+    "MEDIA_DECLINED": discord.Colour.red(),
+    "MEDIA_FAILED": discord.Colour.dark_red(),
+}
+
+
+class WebhookServer:
+    """
+    Receives overseerr's webhook notifications on `POST path`.
+
+    Requests are answered as soon as the payload is parsed, `handler` runs in the background
+    so a slow Discord or overseerr call never makes overseerr's webhook agent time out.
+
+    :param handler: Coroutine function called with every notification
+    :param auth: Expected `Authorization` header, as set in overseerr's webhook settings. Unchecked if empty.
+    :param path: URL path to listen on
+    """
+
+    def __init__(
+        self, handler: WebhookHandler, *, auth: Optional[str] = None, path: str = "/webhook"
+    ) -> None:
+        self._handler = handler
+        self._auth = auth
+        self._path = path
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.received = 0
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self, host: str = "0.0.0.0", port: int = 5056) -> None:
+        app = web.Application()
+        app.router.add_post(self._path, self._receive)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        log.info("Listening for overseerr webhooks on http://%s:%d%s", host, port, self._path)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        for task in list(self._tasks):
+            task.cancel()
+
+    def _authorized(self, request: web.Request) -> bool:
+        if not self._auth:
+            return True
+        given = request.headers.get("Authorization", "")
+        return hmac.compare_digest(given.encode(), self._auth.encode())
+
+    async def _receive(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            log.warning("Rejected webhook from %s: bad authorization", request.remote)
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        try:
+            payload = WebhookPayload(await request.json())
+        except (ValueError, BadValueError) as e:
+            log.warning("Rejected malformed webhook: %s", e)
+            return web.json_response({"message": "Malformed payload"}, status=400)
+        self.received += 1
+        log.debug("Webhook %s: %s", payload.notification_type, payload.subject)
+        task = asyncio.create_task(self._handle(payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response(status=204)
+
+    async def _handle(self, payload: WebhookPayload) -> None:
+        try:
+            await self._handler(payload)
+        except Exception as e:
+            log.error("Failed to handle webhook %s: %s", payload.notification_type, e)
+
+
+def notification_embed(payload: WebhookPayload) -> discord.Embed:
+    """Discord embed announcing a webhook notification"""
+    embed = discord.Embed(
+        title=payload.subject,
+        description=payload.message,
+        colour=NOTIFICATION_COLOURS.get(payload.notification_type, discord.Colour.blurple()),
+    )
+    if payload.image:
+        embed.set_thumbnail(url=payload.image)
+    if payload.request is not None:
+        if payload.request.request_id is not None:
+            embed.add_field(name="Request", value=f"#{payload.request.request_id}", inline=True)
+        requester = payload.request.requested_by_username or payload.request.requested_by_email
+        if requester:
+            embed.add_field(name="Requested By", value=requester, inline=True)
+    embed.set_footer(text=payload.event or payload.notification_type)
+    return embed
+
+
+def parse_notification_types(value: Optional[str]) -> Set[str]:
+    """Parse a comma separated list like `MEDIA_PENDING,MEDIA_AVAILABLE`"""
+    return {item.strip().upper() for item in (value or "").split(",") if item.strip()}